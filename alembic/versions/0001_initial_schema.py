@@ -0,0 +1,124 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('groups',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('info_categories',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('articles',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('article_id', sa.String(length=50), nullable=False),
+    sa.Column('article', sa.String(length=255), nullable=False),
+    sa.Column('approval_group_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['approval_group_id'], ['groups.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('article'),
+    sa.UniqueConstraint('article_id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('group_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.CheckConstraint("role IN ('一般ユーザー', 'SV', '管理者')", name='chk_user_role'),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('proposals',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('article_id', sa.String(length=50), nullable=False),
+    sa.Column('article', sa.String(length=255), nullable=False),
+    sa.Column('type', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('info_category_id', sa.UUID(), nullable=True),
+    sa.Column('keywords', sa.Text(), nullable=True),
+    sa.Column('importance', sa.Boolean(), nullable=True),
+    sa.Column('published_start', sa.Date(), nullable=True),
+    sa.Column('published_end', sa.Date(), nullable=True),
+    sa.Column('target', sa.String(length=10), nullable=True),
+    sa.Column('question', sa.Text(), nullable=True),
+    sa.Column('answer', sa.Text(), nullable=True),
+    sa.Column('add_comments', sa.Text(), nullable=True),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('approval_group_id', sa.UUID(), nullable=False),
+    sa.Column('approved_by', sa.UUID(), nullable=True),
+    sa.Column('approved_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.CheckConstraint("(status != '却下') OR (status = '却下' AND rejection_reason IS NOT NULL AND rejection_reason != '')", name='chk_rejection_reason'),
+    sa.CheckConstraint("status IN ('申請中', '承認済み', '却下')", name='chk_proposal_status'),
+    sa.CheckConstraint("target IN ('社内向け', '社外向け', '該当なし') OR target IS NULL", name='chk_proposal_target'),
+    sa.CheckConstraint("type IN ('修正', '削除')", name='chk_proposal_type'),
+    sa.ForeignKeyConstraint(['approval_group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.article_id'], ),
+    sa.ForeignKeyConstraint(['info_category_id'], ['info_categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('proposals_before',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('proposal_id', sa.UUID(), nullable=False),
+    sa.Column('title_before', sa.String(length=500), nullable=True),
+    sa.Column('info_category_id_before', sa.UUID(), nullable=True),
+    sa.Column('keywords_before', sa.Text(), nullable=True),
+    sa.Column('importance_before', sa.Boolean(), nullable=True),
+    sa.Column('published_start_before', sa.Date(), nullable=True),
+    sa.Column('published_end_before', sa.Date(), nullable=True),
+    sa.Column('target_before', sa.String(length=10), nullable=True),
+    sa.Column('question_before', sa.Text(), nullable=True),
+    sa.Column('answer_before', sa.Text(), nullable=True),
+    sa.Column('add_comments_before', sa.Text(), nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.CheckConstraint("target_before IN ('社内向け', '社外向け', '該当なし') OR target_before IS NULL", name='chk_target_before'),
+    sa.ForeignKeyConstraint(['info_category_id_before'], ['info_categories.id'], ),
+    sa.ForeignKeyConstraint(['proposal_id'], ['proposals.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('proposals_before')
+    op.drop_table('proposals')
+    op.drop_table('users')
+    op.drop_table('articles')
+    op.drop_table('info_categories')
+    op.drop_table('groups')
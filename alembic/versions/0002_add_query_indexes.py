@@ -0,0 +1,42 @@
+"""Add indexes for the proposal list and statistics queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns). Composite indexes replace the single-column
+# idx_proposals_user_id / _status / _approval_group / _created_at from
+# docs/database-design.md, since each of those is a prefix of one below.
+INDEXES = [
+    ('idx_proposals_created_at_id', 'proposals', ['created_at', 'id']),
+    ('idx_proposals_user_created_at', 'proposals', ['user_id', 'created_at']),
+    ('idx_proposals_approval_group_status', 'proposals', ['approval_group_id', 'status', 'created_at', 'id']),
+    ('idx_proposals_status_created_at', 'proposals', ['status', 'created_at', 'id']),
+    ('idx_proposals_article_id', 'proposals', ['article_id']),
+    ('idx_users_group_id', 'users', ['group_id']),
+    ('idx_users_role', 'users', ['role']),
+    ('idx_articles_approval_group', 'articles', ['approval_group_id']),
+    ('idx_proposals_before_proposal_id', 'proposals_before', ['proposal_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
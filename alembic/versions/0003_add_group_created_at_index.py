@@ -0,0 +1,27 @@
+"""Add an approval group / created_at index for SV trend statistics
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_proposals_approval_group_created_at', 'proposals',
+        ['approval_group_id', 'created_at'], unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_proposals_approval_group_created_at', table_name='proposals', if_exists=True)
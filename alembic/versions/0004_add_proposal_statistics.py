@@ -0,0 +1,47 @@
+"""Add the proposal_statistics rollup table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00.000000
+
+The table is filled from the existing proposals; months are computed in
+the business timezone configured in app.config.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('proposal_statistics',
+    sa.Column('approval_group_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('type', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('proposal_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['approval_group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('approval_group_id', 'user_id', 'month', 'type', 'status')
+    )
+    op.create_index('idx_proposal_statistics_user_month', 'proposal_statistics', ['user_id', 'month'], unique=False)
+    op.execute(sa.text(
+        "INSERT INTO proposal_statistics "
+        "(approval_group_id, user_id, month, type, status, proposal_count) "
+        "SELECT approval_group_id, user_id, date_trunc('month', timezone(:tz, created_at))::date, "
+        "type, status, count(*) FROM proposals GROUP BY 1, 2, 3, 4, 5"
+    ).bindparams(tz=settings.business_timezone))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_proposal_statistics_user_month', table_name='proposal_statistics')
+    op.drop_table('proposal_statistics')
@@ -0,0 +1,35 @@
+"""Add a trigram index for proposal search
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+# Must stay identical to app.models.proposal.SEARCH_DOCUMENT_SQL
+SEARCH_DOCUMENT_SQL = (
+    "(coalesce(title, '') || ' ' || coalesce(keywords, '') || ' ' || coalesce(question, '')"
+    " || ' ' || coalesce(answer, '') || ' ' || coalesce(add_comments, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_proposals_search_trgm ON proposals "
+        f"USING gin ({SEARCH_DOCUMENT_SQL} gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_proposals_search_trgm")
@@ -0,0 +1,68 @@
+"""Add the approved_at and updated_at triggers from the design doc
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+UPDATED_AT_TRIGGERS = {
+    "tr_users_updated_at": "users",
+    "tr_infocategories_updated_at": "info_categories",
+    "tr_articles_updated_at": "articles",
+    "tr_proposals_updated_at": "proposals",
+}
+
+
+def upgrade() -> None:
+    # Functions and triggers are replaced so databases built by hand from
+    # docs/database-design.md can be migrated too
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_approved_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          IF NEW.status = '承認済み' AND OLD.status = '申請中' THEN
+            NEW.approved_at = NOW();
+          END IF;
+          RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          NEW.updated_at = NOW();
+          RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS tr_proposals_approved_at ON proposals")
+    op.execute(
+        "CREATE TRIGGER tr_proposals_approved_at BEFORE UPDATE ON proposals "
+        "FOR EACH ROW EXECUTE FUNCTION update_approved_at()"
+    )
+    for trigger, table in UPDATED_AT_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        )
+
+
+def downgrade() -> None:
+    for trigger, table in UPDATED_AT_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    op.execute("DROP TRIGGER IF EXISTS tr_proposals_approved_at ON proposals")
+    op.execute("DROP FUNCTION IF EXISTS update_updated_at_column()")
+    op.execute("DROP FUNCTION IF EXISTS update_approved_at()")
@@ -0,0 +1,51 @@
+"""Add a unigram/bigram index for short search terms
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 18:00:00.000000
+
+pg_trgm cannot use its index for LIKE patterns of one or two characters,
+which covers most Japanese search terms (申請, 承認). This index holds
+the lowercased unigrams and bigrams of the search document.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+# Must stay identical to app.models.proposal.SEARCH_DOCUMENT_SQL
+SEARCH_DOCUMENT_SQL = (
+    "(coalesce(title, '') || ' ' || coalesce(keywords, '') || ' ' || coalesce(question, '')"
+    " || ' ' || coalesce(answer, '') || ' ' || coalesce(add_comments, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION proposal_short_ngrams(doc text)
+        RETURNS text[]
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+          SELECT coalesce(array_agg(DISTINCT gram), '{}')
+          FROM (
+            SELECT substr(lower(doc), i, 1) AS gram FROM generate_series(1, length(doc)) AS i
+            UNION
+            SELECT substr(lower(doc), i, 2) FROM generate_series(1, length(doc) - 1) AS i
+          ) grams
+        $$
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_proposals_search_short_ngrams ON proposals "
+        f"USING gin (proposal_short_ngrams({SEARCH_DOCUMENT_SQL}))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_proposals_search_short_ngrams")
+    op.execute("DROP FUNCTION IF EXISTS proposal_short_ngrams(text)")
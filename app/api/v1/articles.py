@@ -1,21 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from uuid import UUID
 
 from app.database import get_db
+from app.pagination import paginate
+from app.schemas.pagination import Page
 from app.schemas.article import ArticleCreate, ArticleUpdate, ArticleResponse
 from app.models.article import Article
-from app.models.user import User
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
+from app.cache import invalidate_table
+from app.etag import conditional_get
 
 router = APIRouter()
 
+ARTICLE_SORT_KEY = (Article.created_at, Article.id)
+
 @router.post("/", response_model=ArticleResponse)
 async def create_article(
     article_data: ArticleCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new article (admin only)"""
     if current_user.role != "管理者":
@@ -25,7 +31,7 @@ async def create_article(
         )
     
     # Check if article_id already exists
-    existing_article = db.query(Article).filter(Article.article_id == article_data.article_id).first()
+    existing_article = await db.scalar(select(Article).where(Article.article_id == article_data.article_id))
     if existing_article:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,28 +45,33 @@ async def create_article(
     )
     
     db.add(db_article)
-    db.commit()
-    db.refresh(db_article)
+    await db.commit()
+    await db.refresh(db_article)
+    await invalidate_table(Article.__tablename__)
     
     return db_article
 
-@router.get("/", response_model=List[ArticleResponse])
+@router.get("/", response_model=Page[ArticleResponse])
 async def get_articles(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(Article.__tablename__))
 ):
     """Get all articles"""
-    articles = db.query(Article).all()
-    return articles
+    return await paginate(db, Article, ArticleResponse, ARTICLE_SORT_KEY, limit, cursor, fields, etag_headers)
 
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(Article.__tablename__))
 ):
     """Get article by article_id"""
-    article = db.query(Article).filter(Article.article_id == article_id).first()
+    article = await db.scalar(select(Article).where(Article.article_id == article_id))
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,8 +84,8 @@ async def get_article(
 async def update_article(
     article_id: str,
     article_data: ArticleUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update article (admin only)"""
     if current_user.role != "管理者":
@@ -83,7 +94,7 @@ async def update_article(
             detail="Only administrators can update articles"
         )
     
-    article = db.query(Article).filter(Article.article_id == article_id).first()
+    article = await db.scalar(select(Article).where(Article.article_id == article_id))
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,16 +106,17 @@ async def update_article(
     for field, value in update_data.items():
         setattr(article, field, value)
     
-    db.commit()
-    db.refresh(article)
+    await db.commit()
+    await db.refresh(article)
+    await invalidate_table(Article.__tablename__)
     
     return article
 
 @router.delete("/{article_id}")
 async def delete_article(
     article_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete article (admin only)"""
     if current_user.role != "管理者":
@@ -113,14 +125,15 @@ async def delete_article(
             detail="Only administrators can delete articles"
         )
     
-    article = db.query(Article).filter(Article.article_id == article_id).first()
+    article = await db.scalar(select(Article).where(Article.article_id == article_id))
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Article not found"
         )
     
-    db.delete(article)
-    db.commit()
+    await db.delete(article)
+    await db.commit()
+    await invalidate_table(Article.__tablename__)
     
     return {"message": "Article deleted successfully"}
\ No newline at end of file
@@ -1,27 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.user import LoginRequest, TokenResponse
 from app.models.user import User
-from app.auth import verify_password, create_access_token, create_refresh_token
+from app.auth import Principal, verify_and_update_password, create_access_token, create_refresh_token, get_current_user
+from app.auth.keys import KeyLoadError, key_store
+from app.auth.redis import publish_key_reload
 
 router = APIRouter()
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """User login endpoint"""
     # Find user by username
-    user = db.query(User).filter(User.username == login_data.username).first()
+    user = await db.scalar(select(User).where(User.username == login_data.username))
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
+    verified, new_hash = await verify_and_update_password(login_data.password, user.hashed_password)
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password"
+        )
+    
+    # Upgrade the stored hash when the configured bcrypt cost has changed
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create tokens
     access_token = create_access_token({"sub": str(user.id)})
     refresh_token = create_refresh_token({"sub": str(user.id)})
@@ -29,4 +44,27 @@ async def login(
     return TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token
-    )
\ No newline at end of file
+    )
+
+@router.post("/keys/reload")
+async def reload_signing_keys(
+    current_user: Principal = Depends(get_current_user)
+):
+    """Reload JWT keys from disk on every worker (admin only)"""
+    if current_user.role != "管理者":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can reload signing keys"
+        )
+    
+    try:
+        key_store.load()
+    except KeyLoadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    await publish_key_reload()
+    kid, _ = key_store.signing_key()
+    
+    return {"signing_kid": kid, "verification_kids": key_store.verification_kids()}
\ No newline at end of file
@@ -1,21 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from uuid import UUID
 
 from app.database import get_db
+from app.pagination import paginate
+from app.schemas.pagination import Page
 from app.schemas.group import GroupCreate, GroupUpdate, GroupResponse
 from app.models.group import Group
-from app.models.user import User
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
+from app.cache import invalidate_statistics, invalidate_table
+from app.etag import conditional_get
 
 router = APIRouter()
 
+GROUP_SORT_KEY = (Group.name, Group.id)
+
 @router.post("/", response_model=GroupResponse)
 async def create_group(
     group_data: GroupCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new group (admin only)"""
     if current_user.role != "管理者":
@@ -30,28 +36,34 @@ async def create_group(
     )
     
     db.add(db_group)
-    db.commit()
-    db.refresh(db_group)
+    await db.commit()
+    await db.refresh(db_group)
+    await invalidate_table(Group.__tablename__)
+    await invalidate_statistics()
     
     return db_group
 
-@router.get("/", response_model=List[GroupResponse])
+@router.get("/", response_model=Page[GroupResponse])
 async def get_groups(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(Group.__tablename__))
 ):
     """Get all groups"""
-    groups = db.query(Group).all()
-    return groups
+    return await paginate(db, Group, GroupResponse, GROUP_SORT_KEY, limit, cursor, fields, etag_headers)
 
 @router.get("/{group_id}", response_model=GroupResponse)
 async def get_group(
     group_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(Group.__tablename__))
 ):
     """Get group by ID"""
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.scalar(select(Group).where(Group.id == group_id))
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,8 +76,8 @@ async def get_group(
 async def update_group(
     group_id: UUID,
     group_data: GroupUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update group (admin only)"""
     if current_user.role != "管理者":
@@ -74,7 +86,7 @@ async def update_group(
             detail="Only administrators can update groups"
         )
     
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.scalar(select(Group).where(Group.id == group_id))
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,16 +98,18 @@ async def update_group(
     for field, value in update_data.items():
         setattr(group, field, value)
     
-    db.commit()
-    db.refresh(group)
+    await db.commit()
+    await db.refresh(group)
+    await invalidate_table(Group.__tablename__)
+    await invalidate_statistics()
     
     return group
 
 @router.delete("/{group_id}")
 async def delete_group(
     group_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete group (admin only)"""
     if current_user.role != "管理者":
@@ -104,14 +118,16 @@ async def delete_group(
             detail="Only administrators can delete groups"
         )
     
-    group = db.query(Group).filter(Group.id == group_id).first()
+    group = await db.scalar(select(Group).where(Group.id == group_id))
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Group not found"
         )
     
-    db.delete(group)
-    db.commit()
+    await db.delete(group)
+    await db.commit()
+    await invalidate_table(Group.__tablename__)
+    await invalidate_statistics(group_id)
     
     return {"message": "Group deleted successfully"}
\ No newline at end of file
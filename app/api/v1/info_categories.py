@@ -1,21 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
 from uuid import UUID
 
 from app.database import get_db
+from app.pagination import paginate
+from app.schemas.pagination import Page
 from app.schemas.info_category import InfoCategoryCreate, InfoCategoryUpdate, InfoCategoryResponse
 from app.models.info_category import InfoCategory
-from app.models.user import User
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
+from app.cache import invalidate_table
+from app.etag import conditional_get
 
 router = APIRouter()
 
+INFO_CATEGORY_SORT_KEY = (InfoCategory.created_at, InfoCategory.id)
+
 @router.post("/", response_model=InfoCategoryResponse)
 async def create_info_category(
     category_data: InfoCategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new info category (admin only)"""
     if current_user.role != "管理者":
@@ -30,28 +36,33 @@ async def create_info_category(
     )
     
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    await invalidate_table(InfoCategory.__tablename__)
     
     return db_category
 
-@router.get("/", response_model=List[InfoCategoryResponse])
+@router.get("/", response_model=Page[InfoCategoryResponse])
 async def get_info_categories(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(InfoCategory.__tablename__))
 ):
     """Get all info categories"""
-    categories = db.query(InfoCategory).all()
-    return categories
+    return await paginate(db, InfoCategory, InfoCategoryResponse, INFO_CATEGORY_SORT_KEY, limit, cursor, fields, etag_headers)
 
 @router.get("/{category_id}", response_model=InfoCategoryResponse)
 async def get_info_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    etag_headers: Optional[Dict[str, str]] = Depends(conditional_get(InfoCategory.__tablename__))
 ):
     """Get info category by ID"""
-    category = db.query(InfoCategory).filter(InfoCategory.id == category_id).first()
+    category = await db.scalar(select(InfoCategory).where(InfoCategory.id == category_id))
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,8 +75,8 @@ async def get_info_category(
 async def update_info_category(
     category_id: UUID,
     category_data: InfoCategoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update info category (admin only)"""
     if current_user.role != "管理者":
@@ -74,7 +85,7 @@ async def update_info_category(
             detail="Only administrators can update info categories"
         )
     
-    category = db.query(InfoCategory).filter(InfoCategory.id == category_id).first()
+    category = await db.scalar(select(InfoCategory).where(InfoCategory.id == category_id))
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,16 +97,17 @@ async def update_info_category(
     for field, value in update_data.items():
         setattr(category, field, value)
     
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
+    await invalidate_table(InfoCategory.__tablename__)
     
     return category
 
 @router.delete("/{category_id}")
 async def delete_info_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete info category (admin only)"""
     if current_user.role != "管理者":
@@ -104,14 +116,15 @@ async def delete_info_category(
             detail="Only administrators can delete info categories"
         )
     
-    category = db.query(InfoCategory).filter(InfoCategory.id == category_id).first()
+    category = await db.scalar(select(InfoCategory).where(InfoCategory.id == category_id))
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Info category not found"
         )
     
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
+    await invalidate_table(InfoCategory.__tablename__)
     
     return {"message": "Info category deleted successfully"}
\ No newline at end of file
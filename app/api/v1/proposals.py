@@ -1,27 +1,153 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, noload, selectinload
+from typing import List, Literal, Optional
 from uuid import UUID
 
+from app.config import settings
 from app.database import get_db
-from app.schemas.proposal import ProposalCreate, ProposalUpdate, ProposalResponse, ProposalApprovalRequest, ProposalStatus
+from app.pagination import apply_keyset, split_page
+from app.responses import page_response, row_items, schema_columns
+from app.schemas.pagination import Page
+from app.schemas.proposal import (
+    ProposalCreate, ProposalUpdate, ProposalResponse, ProposalApprovalRequest, ProposalStatus,
+    ProposalBatchApprovalRequest, ProposalBatchApprovalResponse, ProposalSearchResult, ProposalDiff,
+    ProposalExpandedResponse
+)
 from app.models.proposal import Proposal
 from app.models.article import Article
-from app.models.user import User
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
+from app.cache import invalidate_statistics
+from app.services import statistics_rollup
+from app.services.proposal_diff import diff, latest_approved_revision, snapshot
+from app.services.proposal_export import PROPOSAL_EXPORT_COLUMNS, stream_proposals
+from app.services.proposal_import import detect_format, import_proposals
+from app.services.proposal_search import highlight, match_condition, rank, search_terms
 
 router = APIRouter()
 
+# Keyset sort key for proposal lists, backed by idx_proposals_created_at_id
+PROPOSAL_SORT_KEY = (Proposal.created_at, Proposal.id)
+
+# Related records that can be embedded in proposal responses with expand=
+PROPOSAL_EXPANSIONS = {
+    "user": Proposal.user,
+    "approval_group": Proposal.approval_group,
+    "info_category": Proposal.info_category,
+    "approver": Proposal.approver,
+}
+
+def expand_options(expand: Optional[str]) -> list:
+    """Loader options for expand=: one SELECT ... IN per requested relationship, none for the rest"""
+    requested = list(dict.fromkeys(e.strip() for e in (expand or "").split(",") if e.strip()))
+    unknown = [e for e in requested if e not in PROPOSAL_EXPANSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown expansions: {', '.join(unknown)}"
+        )
+    return [
+        selectinload(relationship) if name in requested else noload(relationship)
+        for name, relationship in PROPOSAL_EXPANSIONS.items()
+    ]
+
+# Unrequested expansions are null in ProposalExpandedResponse
+PROPOSAL_UNEXPANDED = dict.fromkeys(PROPOSAL_EXPANSIONS)
+
+async def fast_proposal_page(db: AsyncSession, query, cursor: Optional[str], limit: int, descending: bool = False):
+    """Keyset page of proposal column rows serialized with orjson, bypassing ORM hydration and validation"""
+    query = apply_keyset(query, PROPOSAL_SORT_KEY, cursor, limit, descending=descending)
+    rows, next_cursor = split_page((await db.execute(query)).all(), PROPOSAL_SORT_KEY, limit)
+    items = row_items(rows, list(ProposalResponse.model_fields), PROPOSAL_UNEXPANDED)
+    return page_response(items, next_cursor)
+
+def visible_proposals(query, current_user: Principal, status: Optional[ProposalStatus] = None):
+    """Restrict a proposal query to what the user may list, optionally by status"""
+    # Filter based on user role
+    if current_user.role == "管理者":
+        # Admin can see all proposals
+        pass
+    elif current_user.role == "SV":
+        # SV can see proposals for their approval group and their own proposals
+        query = query.where(
+            or_(
+                Proposal.approval_group_id == current_user.group_id,
+                Proposal.user_id == current_user.id
+            )
+        )
+    else:
+        # General users can only see their own proposals
+        query = query.where(Proposal.user_id == current_user.id)
+    
+    # Filter by status if provided
+    if status:
+        query = query.where(Proposal.status == status)
+    
+    return query
+
+def proposal_list_query(current_user: Principal, status: Optional[ProposalStatus] = None, expand: Optional[str] = None):
+    """GET /proposals before paging: bare columns, or ORM rows with the expand= loaders"""
+    if not expand:
+        return visible_proposals(select(*schema_columns(Proposal, ProposalResponse)), current_user, status)
+    return visible_proposals(select(Proposal).options(*expand_options(expand)), current_user, status)
+
+def pending_approval_query(current_user: Principal, expand: Optional[str] = None):
+    """GET /proposals/pending-approval before paging"""
+    if not expand:
+        query = select(*schema_columns(Proposal, ProposalResponse))
+    else:
+        query = select(Proposal).options(*expand_options(expand))
+    query = query.where(Proposal.status == "申請中")
+    
+    if current_user.role == "SV":
+        # SV can only approve proposals for their group
+        query = query.where(Proposal.approval_group_id == current_user.group_id)
+    
+    return query
+
+def search_query(q: str, current_user: Principal, status: Optional[ProposalStatus] = None):
+    """GET /proposals/search before paging, with its keyset sort key"""
+    search_rank = rank(q)
+    query = visible_proposals(select(*Proposal.__table__.columns, search_rank), current_user, status)
+    return query.where(match_condition(search_terms(q))), (search_rank, Proposal.id)
+
+def article_query(article_id: str, with_revision: bool):
+    """The article's approval group, joined to its latest approved revision if requested"""
+    query = select(Article.approval_group_id)
+    if with_revision:
+        revision = latest_approved_revision()
+        query = select(Article.approval_group_id, revision).outerjoin(revision, true())
+    return query.where(Article.article_id == article_id)
+
+def ensure_can_view(proposal: Proposal, current_user: Principal) -> None:
+    """Raise 403 unless the user may see the proposal"""
+    # Check access permissions
+    if (current_user.role == "一般ユーザー" and proposal.user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    elif (current_user.role == "SV" and 
+          proposal.user_id != current_user.id and 
+          proposal.approval_group_id != current_user.group_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
 @router.post("/", response_model=ProposalResponse)
 async def create_proposal(
     proposal_data: ProposalCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Create a new proposal"""
-    # Get article to determine approval group
-    article = db.query(Article).filter(Article.article_id == proposal_data.article_id).first()
+    """Create a new proposal together with its proposals_before snapshot"""
+    # Get article to determine approval group; without client-supplied
+    # before values, fetch the last approved revision in the same query
+    query = article_query(proposal_data.article_id, with_revision=proposal_data.before is None)
+    article = (await db.execute(query)).first()
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -47,104 +173,282 @@ async def create_proposal(
         approval_group_id=article.approval_group_id
     )
     
+    # Inserted in the same flush as the proposal
+    if proposal_data.before is not None:
+        db_proposal.proposal_before = snapshot(proposal_data.before.dict())
+    elif article.revision_id is not None:
+        db_proposal.proposal_before = snapshot(article._mapping)
+    
     db.add(db_proposal)
-    db.commit()
-    db.refresh(db_proposal)
+    await db.flush()
+    await statistics_rollup.adjust(db, db_proposal.id, 1)
+    await db.commit()
+    await db.refresh(db_proposal)
+    await invalidate_statistics(db_proposal.approval_group_id)
     
     return db_proposal
 
-@router.get("/", response_model=List[ProposalResponse])
+@router.post("/bulk")
+async def bulk_create_proposals(
+    file: UploadFile = File(...),
+    format: Optional[Literal["jsonl", "csv"]] = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Create proposals from a JSONL or CSV upload, streaming NDJSON progress"""
+    # Read at most one byte past the limit instead of the whole upload
+    data = await file.read(settings.bulk_import_max_bytes + 1)
+    if len(data) > settings.bulk_import_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File must not exceed {settings.bulk_import_max_bytes} bytes"
+        )
+    try:
+        content = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+    
+    file_format = format or detect_format(file.filename, file.content_type)
+    return StreamingResponse(
+        import_proposals(content, file_format, current_user.id),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/", response_model=Page[ProposalExpandedResponse])
 async def get_proposals(
     status: Optional[ProposalStatus] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get proposals based on user role and status"""
-    query = db.query(Proposal)
-    
-    # Filter based on user role
-    if current_user.role == "管理者":
-        # Admin can see all proposals
-        pass
-    elif current_user.role == "SV":
-        # SV can see proposals for their approval group and their own proposals
-        query = query.filter(
-            or_(
-                Proposal.approval_group_id == current_user.group_id,
-                Proposal.user_id == current_user.id
-            )
+    """Get proposals based on user role and status, newest first"""
+    query = proposal_list_query(current_user, status, expand)
+    if not expand:
+        return await fast_proposal_page(db, query, cursor, limit, descending=True)
+
+    query = apply_keyset(query, PROPOSAL_SORT_KEY, cursor, limit, descending=True)
+    result = await db.scalars(query)
+    proposals, next_cursor = split_page(result.all(), PROPOSAL_SORT_KEY, limit)
+    return {"items": proposals, "next_cursor": next_cursor}
+
+@router.get("/pending-approval", response_model=Page[ProposalExpandedResponse])
+async def get_pending_proposals(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get proposals pending approval for SV/Admin, oldest first"""
+    if current_user.role not in ["SV", "管理者"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only SV and administrators can view pending approvals"
         )
-    else:
-        # General users can only see their own proposals
-        query = query.filter(Proposal.user_id == current_user.id)
     
-    # Filter by status if provided
-    if status:
-        query = query.filter(Proposal.status == status)
+    query = pending_approval_query(current_user, expand)
+    if not expand:
+        return await fast_proposal_page(db, query, cursor, limit)
     
-    proposals = query.all()
-    return proposals
+    query = apply_keyset(query, PROPOSAL_SORT_KEY, cursor, limit)
+    result = await db.scalars(query)
+    proposals, next_cursor = split_page(result.all(), PROPOSAL_SORT_KEY, limit)
+    return {"items": proposals, "next_cursor": next_cursor}
 
-@router.get("/pending-approval", response_model=List[ProposalResponse])
-async def get_pending_proposals(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/diffs", response_model=Page[ProposalDiff])
+async def get_proposal_diffs(
+    status: Optional[ProposalStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get proposals pending approval for SV/Admin"""
+    """Get diffs for a page of visible proposals, newest first, in one joined query"""
+    query = visible_proposals(select(Proposal), current_user, status).outerjoin(
+        Proposal.proposal_before
+    ).options(contains_eager(Proposal.proposal_before))
+    query = apply_keyset(query, PROPOSAL_SORT_KEY, cursor, limit, descending=True)
+    result = await db.scalars(query)
+    proposals, next_cursor = split_page(result.all(), PROPOSAL_SORT_KEY, limit)
+    return {"items": [diff(proposal) for proposal in proposals], "next_cursor": next_cursor}
+
+@router.get("/search", response_model=Page[ProposalSearchResult])
+async def search_proposals(
+    q: str = Query(..., max_length=200, pattern=r"\S"),
+    status: Optional[ProposalStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Search the text of proposals visible to the user, best matches first"""
+    terms = search_terms(q)
+    query, sort_key = search_query(q, current_user, status)
+    query = apply_keyset(query, sort_key, cursor, limit, descending=True)
+    result = await db.execute(query)
+    rows, next_cursor = split_page(result.all(), sort_key, limit)
+    items = [{**row._mapping, "highlights": highlight(row, terms)} for row in rows]
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/export")
+async def export_proposals(
+    format: Literal["csv", "ndjson"] = "csv",
+    status: Optional[ProposalStatus] = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Stream every proposal visible to the user as CSV or NDJSON, oldest first"""
+    query = visible_proposals(select(*PROPOSAL_EXPORT_COLUMNS), current_user, status)
+    query = query.order_by(*PROPOSAL_SORT_KEY)
+    return StreamingResponse(
+        stream_proposals(query, format),
+        media_type="text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="proposals.{format}"'}
+    )
+
+@router.post("/batch-approve", response_model=ProposalBatchApprovalResponse)
+async def batch_approve_or_reject_proposals(
+    approval_data: ProposalBatchApprovalRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Approve or reject several proposals at once (SV/Admin only)"""
     if current_user.role not in ["SV", "管理者"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only SV and administrators can view pending approvals"
+            detail="Only SV and administrators can approve proposals"
         )
     
-    query = db.query(Proposal).filter(Proposal.status == "申請中")
+    if approval_data.status == ProposalStatus.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status must be approved or rejected"
+        )
     
+    # Validate rejection reason
+    if approval_data.status == ProposalStatus.REJECTED and not approval_data.rejection_reason:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rejection reason is required when rejecting a proposal"
+        )
+    
+    ids = list(dict.fromkeys(approval_data.ids))
+    
+    # The same checks as the single-proposal endpoint, applied in the WHERE
+    # clause; the status condition keeps concurrent decisions from both winning.
+    query = update(Proposal).where(
+        Proposal.id.in_(ids),
+        Proposal.status == "申請中",
+        Proposal.user_id != current_user.id
+    )
     if current_user.role == "SV":
-        # SV can only approve proposals for their group
-        query = query.filter(Proposal.approval_group_id == current_user.group_id)
+        query = query.where(Proposal.approval_group_id == current_user.group_id)
+    
+    decision = {
+        "status": approval_data.status,
+        "approved_by": current_user.id,
+        "rejection_reason": approval_data.rejection_reason,
+        "updated_at": func.now(),
+    }
+    if approval_data.status == ProposalStatus.APPROVED:
+        decision["approved_at"] = func.now()
+    
+    updated = (await db.execute(query.values(**decision).returning(
+        Proposal.id, Proposal.approval_group_id
+    ).execution_options(synchronize_session=False))).all()
+    updated_ids = [row.id for row in updated]
+    updated_set = set(updated_ids)
     
-    proposals = query.all()
-    return proposals
+    await statistics_rollup.adjust_many(db, updated_ids, -1, status="申請中")
+    await statistics_rollup.adjust_many(db, updated_ids, 1)
+    
+    # Explain the rest with one lookup
+    failures = {}
+    remaining = [proposal_id for proposal_id in ids if proposal_id not in updated_set]
+    if remaining:
+        rows = (await db.execute(select(
+            Proposal.id, Proposal.status, Proposal.user_id, Proposal.approval_group_id
+        ).where(Proposal.id.in_(remaining)))).all()
+        found = {row.id: row for row in rows}
+        for proposal_id in remaining:
+            row = found.get(proposal_id)
+            if row is None:
+                failures[proposal_id] = "Proposal not found"
+            elif current_user.role == "SV" and row.approval_group_id != current_user.group_id:
+                failures[proposal_id] = "You can only approve proposals for your group"
+            elif row.status != "申請中":
+                failures[proposal_id] = "Proposal is not pending approval"
+            else:
+                failures[proposal_id] = "You cannot approve your own proposal"
+    
+    await db.commit()
+    if updated:
+        await invalidate_statistics(*{row.approval_group_id for row in updated})
+    
+    results = [
+        {"id": proposal_id, "success": proposal_id not in failures, "detail": failures.get(proposal_id)}
+        for proposal_id in ids
+    ]
+    return {
+        "status": approval_data.status,
+        "succeeded": len(updated_ids),
+        "failed": len(failures),
+        "results": results
+    }
 
-@router.get("/{proposal_id}", response_model=ProposalResponse)
+@router.get("/{proposal_id}", response_model=ProposalExpandedResponse)
 async def get_proposal(
     proposal_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get proposal by ID"""
-    proposal = db.query(Proposal).filter(Proposal.id == proposal_id).first()
+    proposal = await db.scalar(select(Proposal).options(*expand_options(expand)).where(Proposal.id == proposal_id))
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proposal not found"
         )
     
-    # Check access permissions
-    if (current_user.role == "一般ユーザー" and proposal.user_id != current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    elif (current_user.role == "SV" and 
-          proposal.user_id != current_user.id and 
-          proposal.approval_group_id != current_user.group_id):
+    ensure_can_view(proposal, current_user)
+    
+    return proposal
+
+@router.get("/{proposal_id}/diff", response_model=ProposalDiff)
+async def get_proposal_diff(
+    proposal_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get the fields a proposal changes compared with its before snapshot"""
+    proposal = await db.scalar(select(Proposal).outerjoin(
+        Proposal.proposal_before
+    ).options(
+        contains_eager(Proposal.proposal_before)
+    ).where(Proposal.id == proposal_id))
+    if not proposal:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proposal not found"
         )
     
-    return proposal
+    ensure_can_view(proposal, current_user)
+    
+    return diff(proposal)
 
 @router.put("/{proposal_id}", response_model=ProposalResponse)
 async def update_proposal(
     proposal_id: UUID,
     proposal_data: ProposalUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update proposal (only by creator and only if pending)"""
-    proposal = db.query(Proposal).filter(Proposal.id == proposal_id).first()
+    proposal = await db.scalar(select(Proposal).where(Proposal.id == proposal_id))
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -169,8 +473,8 @@ async def update_proposal(
     for field, value in update_data.items():
         setattr(proposal, field, value)
     
-    db.commit()
-    db.refresh(proposal)
+    await db.commit()
+    await db.refresh(proposal)
     
     return proposal
 
@@ -178,8 +482,8 @@ async def update_proposal(
 async def approve_or_reject_proposal(
     proposal_id: UUID,
     approval_data: ProposalApprovalRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Approve or reject proposal (SV/Admin only)"""
     if current_user.role not in ["SV", "管理者"]:
@@ -188,7 +492,9 @@ async def approve_or_reject_proposal(
             detail="Only SV and administrators can approve proposals"
         )
     
-    proposal = db.query(Proposal).filter(Proposal.id == proposal_id).first()
+    # Lock the row so concurrent decisions see each other's status and the
+    # rollup moves the count out of pending only once
+    proposal = await db.scalar(select(Proposal).where(Proposal.id == proposal_id).with_for_update())
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,24 +530,32 @@ async def approve_or_reject_proposal(
             detail="Rejection reason is required when rejecting a proposal"
         )
     
-    # Update proposal
+    # Update proposal, moving its rollup count from the old status to the new one
+    await statistics_rollup.adjust(db, proposal.id, -1)
     proposal.status = approval_data.status
     proposal.approved_by = current_user.id
     proposal.rejection_reason = approval_data.rejection_reason
+    if approval_data.status == ProposalStatus.APPROVED:
+        # Also set by tr_proposals_approved_at; explicit for databases without it
+        proposal.approved_at = func.now()
+    await db.flush()
+    await statistics_rollup.adjust(db, proposal.id, 1)
     
-    db.commit()
-    db.refresh(proposal)
+    await db.commit()
+    await db.refresh(proposal)
+    await invalidate_statistics(proposal.approval_group_id)
     
     return proposal
 
 @router.delete("/{proposal_id}")
 async def delete_proposal(
     proposal_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete proposal (creator or admin only)"""
-    proposal = db.query(Proposal).filter(Proposal.id == proposal_id).first()
+    # Locked so a concurrent decision or delete cannot adjust the rollup from the same stale state
+    proposal = await db.scalar(select(Proposal).where(Proposal.id == proposal_id).with_for_update())
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -255,7 +569,9 @@ async def delete_proposal(
             detail="Access denied"
         )
     
-    db.delete(proposal)
-    db.commit()
+    await statistics_rollup.adjust(db, proposal.id, -1)
+    await db.delete(proposal)
+    await db.commit()
+    await invalidate_statistics(proposal.approval_group_id)
     
     return {"message": "Proposal deleted successfully"}
\ No newline at end of file
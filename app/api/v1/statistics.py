@@ -1,25 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
-from typing import Dict, List, Optional
-from datetime import datetime, date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Date, cast, func, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Literal, Optional
+from datetime import datetime, date, time, timedelta
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
-from app.database import get_db
+from app.cache import response_cache, statistics_version
+from app.config import settings
+from app.database import AsyncSessionLocal, get_db
 from app.models.proposal import Proposal
-from app.models.user import User
+from app.models.proposal_statistic import ProposalStatistic
 from app.models.group import Group
-from app.auth import get_current_user
+from app.auth import Principal, get_current_user
 
 router = APIRouter()
 
+BUSINESS_TZ = ZoneInfo(settings.business_timezone)
+PERIOD_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+
+def _local_midnight(day: date) -> datetime:
+    """Start of a business day as an aware datetime"""
+    return datetime.combine(day, time.min, tzinfo=BUSINESS_TZ)
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def _period_start(day: date, period: str) -> date:
+    """First day of the month, quarter or year containing `day`"""
+    if period == "year":
+        return date(day.year, 1, 1)
+    if period == "quarter":
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return date(day.year, day.month, 1)
+
+def _bucket(period: str):
+    """First day of the business-timezone period containing created_at"""
+    return cast(func.date_trunc(period, func.timezone(settings.business_timezone, Proposal.created_at)), Date)
+
+def _rollup_count(*conditions):
+    """Sum of rollup counts, restricted to rows matching `conditions`"""
+    total = func.sum(ProposalStatistic.proposal_count)
+    if conditions:
+        total = total.filter(and_(*conditions))
+    return func.coalesce(total, 0)
+
+def _monthly_proposals_query(user_id: UUID, year: int, month: int):
+    """One user's proposal count for one month, from the rollup"""
+    return select(_rollup_count()).where(
+        and_(
+            ProposalStatistic.user_id == user_id,
+            ProposalStatistic.month == date(year, month, 1)
+        )
+    )
+
+def _personal_statistics_query(user_id: UUID, period: str, start_date: date, end_date: date):
+    """Counts per period and status for one user, oldest period first"""
+    if start_date.day == 1 and (end_date + timedelta(days=1)).day == 1:
+        # Whole months can be answered from the rollup
+        bucket = cast(func.date_trunc(period, ProposalStatistic.month), Date).label('bucket')
+        query = select(
+            bucket,
+            _rollup_count().label('total'),
+            _rollup_count(ProposalStatistic.status == "申請中").label('pending'),
+            _rollup_count(ProposalStatistic.status == "承認済み").label('approved'),
+            _rollup_count(ProposalStatistic.status == "却下").label('rejected')
+        ).where(
+            ProposalStatistic.user_id == user_id,
+            ProposalStatistic.month >= start_date,
+            ProposalStatistic.month <= end_date
+        )
+    else:
+        bucket = _bucket(period).label('bucket')
+        query = select(
+            bucket,
+            func.count(Proposal.id).label('total'),
+            func.count(Proposal.id).filter(Proposal.status == "申請中").label('pending'),
+            func.count(Proposal.id).filter(Proposal.status == "承認済み").label('approved'),
+            func.count(Proposal.id).filter(Proposal.status == "却下").label('rejected')
+        ).where(
+            Proposal.user_id == user_id,
+            Proposal.created_at >= _local_midnight(start_date),
+            Proposal.created_at < _local_midnight(end_date + timedelta(days=1))
+        )
+    return query.group_by(bucket).order_by(bucket)
+
 @router.get("/user/monthly-proposals")
 async def get_user_monthly_proposals(
-    year: int,
-    month: int,
+    year: int = Query(..., ge=1, le=9998),
+    month: int = Query(..., ge=1, le=12),
     user_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get monthly proposal count for a user"""
     target_user_id = user_id if user_id else current_user.id
@@ -31,21 +105,75 @@ async def get_user_monthly_proposals(
             detail="Access denied"
         )
     
-    count = db.query(func.count(Proposal.id)).filter(
-        and_(
-            Proposal.user_id == target_user_id,
-            extract('year', Proposal.created_at) == year,
-            extract('month', Proposal.created_at) == month
-        )
-    ).scalar()
+    count = await db.scalar(_monthly_proposals_query(target_user_id, year, month))
     
     return {"count": count, "year": year, "month": month}
 
+@router.get("/personal")
+async def get_personal_statistics(
+    user_id: Optional[UUID] = None,
+    period: Literal["month", "quarter", "year"] = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get proposal counts for a user per month, quarter or year"""
+    target_user_id = user_id if user_id else current_user.id
+    
+    # Permission check
+    if (current_user.role == "一般ユーザー" and target_user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    # Defaults to the current business year up to the end of this month
+    if end_date is None:
+        end_date = _add_months(datetime.now(BUSINESS_TZ).date(), 1) - timedelta(days=1)
+    if start_date is None:
+        start_date = date(end_date.year, 1, 1)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
+    
+    query = _personal_statistics_query(target_user_id, period, start_date, end_date)
+    results = (await db.execute(query)).all()
+    
+    rows = {row.bucket: row for row in results}
+    
+    # Fill in empty periods with 0
+    statistics = []
+    period_start = _period_start(start_date, period)
+    while period_start <= end_date:
+        row = rows.get(period_start)
+        total = row.total if row else 0
+        approved = row.approved if row else 0
+        statistics.append({
+            "period_start": period_start,
+            "total_proposals": total,
+            "pending_proposals": row.pending if row else 0,
+            "approved_proposals": approved,
+            "rejected_proposals": row.rejected if row else 0,
+            "approval_rate": round(approved / total * 100, 2) if total > 0 else 0
+        })
+        period_start = _add_months(period_start, PERIOD_MONTHS[period])
+    
+    return {
+        "user_id": target_user_id,
+        "period": period,
+        "start_date": start_date,
+        "end_date": end_date,
+        "statistics": statistics
+    }
+
 @router.get("/user/approval-rate")
 async def get_user_approval_rate(
     user_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get approval rate for a user"""
     target_user_id = user_id if user_id else current_user.id
@@ -57,16 +185,14 @@ async def get_user_approval_rate(
             detail="Access denied"
         )
     
-    total_count = db.query(func.count(Proposal.id)).filter(
-        Proposal.user_id == target_user_id
-    ).scalar()
-    
-    approved_count = db.query(func.count(Proposal.id)).filter(
-        and_(
-            Proposal.user_id == target_user_id,
-            Proposal.status == "承認済み"
-        )
-    ).scalar()
+    counts = (await db.execute(select(
+        _rollup_count().label('total'),
+        _rollup_count(ProposalStatistic.status == "承認済み").label('approved')
+    ).where(
+        ProposalStatistic.user_id == target_user_id
+    ))).one()
+    total_count = counts.total
+    approved_count = counts.approved
     
     approval_rate = (approved_count / total_count * 100) if total_count > 0 else 0
     
@@ -79,8 +205,8 @@ async def get_user_approval_rate(
 @router.get("/user/proposal-summary")
 async def get_user_proposal_summary(
     user_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get detailed proposal summary for a user"""
     target_user_id = user_id if user_id else current_user.id
@@ -93,20 +219,20 @@ async def get_user_proposal_summary(
         )
     
     # Get counts by status
-    status_counts = db.query(
-        Proposal.status,
-        func.count(Proposal.id).label('count')
-    ).filter(
-        Proposal.user_id == target_user_id
-    ).group_by(Proposal.status).all()
+    status_counts = (await db.execute(select(
+        ProposalStatistic.status,
+        _rollup_count().label('count')
+    ).where(
+        ProposalStatistic.user_id == target_user_id
+    ).group_by(ProposalStatistic.status).having(_rollup_count() > 0))).all()
     
     # Get counts by type
-    type_counts = db.query(
-        Proposal.type,
-        func.count(Proposal.id).label('count')
-    ).filter(
-        Proposal.user_id == target_user_id
-    ).group_by(Proposal.type).all()
+    type_counts = (await db.execute(select(
+        ProposalStatistic.type,
+        _rollup_count().label('count')
+    ).where(
+        ProposalStatistic.user_id == target_user_id
+    ).group_by(ProposalStatistic.type).having(_rollup_count() > 0))).all()
     
     # Format results
     status_summary = {status: count for status, count in status_counts}
@@ -117,10 +243,57 @@ async def get_user_proposal_summary(
         "type_summary": type_summary
     }
 
+def _scoped(query, current_user: Principal):
+    """Limit a rollup query to an SV's group; administrators see every group"""
+    if current_user.role == "SV":
+        # An SV without a group compares against NULL and matches nothing
+        query = query.where(ProposalStatistic.approval_group_id == current_user.group_id)
+    return query
+
+def _monthly_trends_query(year: int, current_user: Principal):
+    """Rollup counts per month of `year` within the user's scope"""
+    query = select(
+        ProposalStatistic.month,
+        _rollup_count().label('count')
+    ).where(
+        ProposalStatistic.month >= date(year, 1, 1),
+        ProposalStatistic.month < date(year + 1, 1, 1)
+    )
+    
+    # Filter by group for SV
+    query = _scoped(query, current_user)
+    return query.group_by(ProposalStatistic.month).order_by(ProposalStatistic.month)
+
+def _approval_statistics_query(current_user: Principal):
+    """Rollup counts per status within the user's scope"""
+    # Count every status in one pass over the filtered rows
+    query = select(
+        _rollup_count().label('total'),
+        _rollup_count(ProposalStatistic.status == "申請中").label('pending'),
+        _rollup_count(ProposalStatistic.status == "承認済み").label('approved'),
+        _rollup_count(ProposalStatistic.status == "却下").label('rejected')
+    )
+    
+    # Filter by group for SV
+    return _scoped(query, current_user)
+
+async def _cached(endpoint: str, current_user: Principal, params: Dict, compute):
+    # compute() may be shared by concurrent requests and outlive this one, so
+    # it opens its own session instead of using the request's
+    if current_user.role == "管理者":
+        version = statistics_version()
+    elif current_user.group_id is not None:
+        version = statistics_version(current_user.group_id)
+    else:
+        # Never share the admin entry; the scoped result is empty anyway
+        return await compute()
+    return await response_cache.get_or_compute(
+        endpoint, version, params, compute, settings.statistics_cache_ttl_seconds
+    )
+
 @router.get("/group/proposal-counts")
 async def get_group_proposal_counts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get proposal counts by group (admin only)"""
     if current_user.role != "管理者":
@@ -129,22 +302,25 @@ async def get_group_proposal_counts(
             detail="Only administrators can view group statistics"
         )
     
-    results = db.query(
-        Group.name,
-        func.count(Proposal.id).label('proposal_count')
-    ).outerjoin(
-        Proposal, Group.id == Proposal.approval_group_id
-    ).group_by(
-        Group.id, Group.name
-    ).all()
+    async def compute():
+        async with AsyncSessionLocal() as db:
+            results = (await db.execute(select(
+                Group.name,
+                _rollup_count().label('proposal_count')
+            ).outerjoin(
+                ProposalStatistic, Group.id == ProposalStatistic.approval_group_id
+            ).group_by(
+                Group.id, Group.name
+            ))).all()
+        
+        return [{"group_name": name, "proposal_count": count} for name, count in results]
     
-    return [{"group_name": name, "proposal_count": count} for name, count in results]
+    return await _cached("group-proposal-counts", current_user, {}, compute)
 
 @router.get("/monthly-trends")
 async def get_monthly_trends(
-    year: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    year: int = Query(..., ge=1, le=9998),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get monthly proposal trends (admin/SV only)"""
     if current_user.role == "一般ユーザー":
@@ -153,41 +329,29 @@ async def get_monthly_trends(
             detail="Access denied"
         )
     
-    query = db.query(
-        extract('month', Proposal.created_at).label('month'),
-        func.count(Proposal.id).label('count')
-    ).filter(
-        extract('year', Proposal.created_at) == year
-    )
+    async def compute():
+        async with AsyncSessionLocal() as db:
+            results = (await db.execute(_monthly_trends_query(year, current_user))).all()
+        
+        # Fill in missing months with 0
+        monthly_data = {}
+        for month_start, count in results:
+            monthly_data[month_start.month] = count
+        
+        trend_data = []
+        for month in range(1, 13):
+            trend_data.append({
+                "month": month,
+                "count": monthly_data.get(month, 0)
+            })
+        
+        return {"year": year, "monthly_trends": trend_data}
     
-    # Filter by group for SV
-    if current_user.role == "SV":
-        query = query.filter(Proposal.approval_group_id == current_user.group_id)
-    
-    results = query.group_by(
-        extract('month', Proposal.created_at)
-    ).order_by(
-        extract('month', Proposal.created_at)
-    ).all()
-    
-    # Fill in missing months with 0
-    monthly_data = {}
-    for month, count in results:
-        monthly_data[int(month)] = count
-    
-    trend_data = []
-    for month in range(1, 13):
-        trend_data.append({
-            "month": month,
-            "count": monthly_data.get(month, 0)
-        })
-    
-    return {"year": year, "monthly_trends": trend_data}
+    return await _cached("monthly-trends", current_user, {"year": year}, compute)
 
 @router.get("/approval-statistics")
 async def get_approval_statistics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get approval statistics (admin/SV only)"""
     if current_user.role == "一般ユーザー":
@@ -196,25 +360,24 @@ async def get_approval_statistics(
             detail="Access denied"
         )
     
-    query = db.query(Proposal)
-    
-    # Filter by group for SV
-    if current_user.role == "SV":
-        query = query.filter(Proposal.approval_group_id == current_user.group_id)
+    async def compute():
+        async with AsyncSessionLocal() as db:
+            counts = (await db.execute(_approval_statistics_query(current_user))).one()
+        total_proposals = counts.total
+        pending_proposals = counts.pending
+        approved_proposals = counts.approved
+        rejected_proposals = counts.rejected
+        
+        approval_rate = (approved_proposals / total_proposals * 100) if total_proposals > 0 else 0
+        rejection_rate = (rejected_proposals / total_proposals * 100) if total_proposals > 0 else 0
+        
+        return {
+            "total_proposals": total_proposals,
+            "pending_proposals": pending_proposals,
+            "approved_proposals": approved_proposals,
+            "rejected_proposals": rejected_proposals,
+            "approval_rate": round(approval_rate, 2),
+            "rejection_rate": round(rejection_rate, 2)
+        }
     
-    total_proposals = query.count()
-    pending_proposals = query.filter(Proposal.status == "申請中").count()
-    approved_proposals = query.filter(Proposal.status == "承認済み").count()
-    rejected_proposals = query.filter(Proposal.status == "却下").count()
-    
-    approval_rate = (approved_proposals / total_proposals * 100) if total_proposals > 0 else 0
-    rejection_rate = (rejected_proposals / total_proposals * 100) if total_proposals > 0 else 0
-    
-    return {
-        "total_proposals": total_proposals,
-        "pending_proposals": pending_proposals,
-        "approved_proposals": approved_proposals,
-        "rejected_proposals": rejected_proposals,
-        "approval_rate": round(approval_rate, 2),
-        "rejection_rate": round(rejection_rate, 2)
-    }
\ No newline at end of file
+    return await _cached("approval-statistics", current_user, {}, compute)
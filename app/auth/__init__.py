@@ -1,15 +1,20 @@
 from .jwt import create_access_token, create_refresh_token, verify_token, get_current_user
-from .redis import redis_client, add_token_to_blacklist, is_token_blacklisted
-from .password import verify_password, get_password_hash
+from .principal import Principal, principal_cache
+from .redis import redis_client, add_token_to_blacklist, is_token_blacklisted, invalidate_principal
+from .password import verify_password, verify_and_update_password, get_password_hash
 
 __all__ = [
     "create_access_token",
     "create_refresh_token", 
     "verify_token",
     "get_current_user",
+    "Principal",
+    "principal_cache",
     "redis_client",
     "add_token_to_blacklist",
     "is_token_blacklisted",
+    "invalidate_principal",
     "verify_password",
+    "verify_and_update_password",
     "get_password_hash"
 ]
\ No newline at end of file
@@ -3,38 +3,19 @@ from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID, uuid4
 
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from .keys import key_store
+from .principal import Principal, principal_cache
 from .redis import is_token_blacklisted
 
 security = HTTPBearer()
 
-def load_private_key() -> str:
-    """Load RSA private key from file"""
-    try:
-        with open(settings.jwt_private_key_path, "r") as f:
-            return f.read()
-    except FileNotFoundError:
-        raise HTTPException(
-            status_code=500,
-            detail="JWT private key not found"
-        )
-
-def load_public_key() -> str:
-    """Load RSA public key from file"""
-    try:
-        with open(settings.jwt_public_key_path, "r") as f:
-            return f.read()
-    except FileNotFoundError:
-        raise HTTPException(
-            status_code=500,
-            detail="JWT public key not found"
-        )
-
 def create_access_token(data: Dict[str, Any]) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -45,8 +26,8 @@ def create_access_token(data: Dict[str, Any]) -> str:
         "jti": str(uuid4())
     })
     
-    private_key = load_private_key()
-    encoded_jwt = jwt.encode(to_encode, private_key, algorithm=settings.jwt_algorithm)
+    kid, private_key = key_store.signing_key()
+    encoded_jwt = jwt.encode(to_encode, private_key, algorithm=settings.jwt_algorithm, headers={"kid": kid})
     return encoded_jwt
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
@@ -59,14 +40,20 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         "jti": str(uuid4())
     })
     
-    private_key = load_private_key()
-    encoded_jwt = jwt.encode(to_encode, private_key, algorithm=settings.jwt_algorithm)
+    kid, private_key = key_store.signing_key()
+    encoded_jwt = jwt.encode(to_encode, private_key, algorithm=settings.jwt_algorithm, headers={"kid": kid})
     return encoded_jwt
 
 async def verify_token(token: str) -> Dict[str, Any]:
     """Verify JWT token"""
     try:
-        public_key = load_public_key()
+        header = jwt.get_unverified_header(token)
+        public_key = key_store.verification_key(header.get("kid"))
+        if public_key is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token"
+            )
         payload = jwt.decode(token, public_key, algorithms=[settings.jwt_algorithm])
         
         # Check if token is blacklisted
@@ -86,8 +73,8 @@ async def verify_token(token: str) -> Dict[str, Any]:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """Get current user from JWT token"""
     payload = await verify_token(credentials.credentials)
     
@@ -98,18 +85,28 @@ async def get_current_user(
             detail="Invalid token type"
         )
     
-    user_id = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token payload invalid"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    generation = principal_cache.generation
+    row = (await db.execute(
+        select(User.id, User.role, User.group_id).where(User.id == user_id)
+    )).first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    return user
\ No newline at end of file
+    principal = Principal(id=row.id, role=row.role, group_id=row.group_id)
+    principal_cache.set(principal, generation)
+    return principal
\ No newline at end of file
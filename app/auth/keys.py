@@ -0,0 +1,173 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_RELOAD_CHANNEL = "jwt_keys:reload"
+
+
+class KeyLoadError(Exception):
+    """A JWT key file could not be read"""
+
+
+def _read_key(path: str, algorithm: str) -> Key:
+    with open(path, "r") as f:
+        return jwk.construct(f.read(), algorithm)
+
+
+def _key_id(public_key: Key) -> str:
+    """RFC 7638 style thumbprint, so every worker derives the same kid"""
+    jwk_dict = public_key.to_dict()
+    members = {name: jwk_dict[name] for name in ("e", "kty", "n")}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode()
+
+
+class KeyStore:
+    """Parsed JWT keys held in memory.
+
+    The private key is used for signing; verification accepts the current
+    public key, any extra public keys from settings and, for a grace period
+    after a reload, the public keys that were current before it.
+
+    Once start() has been called, reloads requested on any worker arrive
+    over the Redis pub/sub channel so every worker picks up the new keys.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._signing: Optional[Tuple[str, Key]] = None
+        self._verification: Dict[str, Key] = {}
+        self._retired: Dict[str, Tuple[Key, float]] = {}
+        # Published with reload requests so a worker skips its own
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._signing is not None
+
+    def load(self) -> None:
+        """(Re)load keys from disk; the previous keys stay valid for the grace period"""
+        algorithm = settings.jwt_algorithm
+        try:
+            private_key = _read_key(settings.jwt_private_key_path, algorithm)
+        except FileNotFoundError:
+            raise KeyLoadError("JWT private key not found")
+        try:
+            public_key = _read_key(settings.jwt_public_key_path, algorithm)
+        except FileNotFoundError:
+            raise KeyLoadError("JWT public key not found")
+
+        kid = _key_id(public_key)
+        verification = {kid: public_key}
+        for path in settings.jwt_additional_public_key_paths:
+            try:
+                extra_key = _read_key(path, algorithm)
+            except FileNotFoundError:
+                logger.warning("Additional JWT public key not found: %s", path)
+                continue
+            verification.setdefault(_key_id(extra_key), extra_key)
+
+        grace_minutes = settings.jwt_key_rotation_grace_minutes
+        if grace_minutes is None:
+            grace_minutes = settings.refresh_token_expire_days * 24 * 60
+        now = time.monotonic()
+        with self._lock:
+            retired = {k: v for k, v in self._retired.items() if v[1] > now}
+            for old_kid, old_key in self._verification.items():
+                if old_kid not in verification:
+                    retired[old_kid] = (old_key, now + grace_minutes * 60)
+            for new_kid in verification:
+                retired.pop(new_kid, None)
+            self._signing = (kid, private_key)
+            self._verification = verification
+            self._retired = retired
+
+        logger.info("Loaded JWT keys (signing kid=%s, verification kids=%s)", kid, self.verification_kids())
+
+    def reload(self) -> None:
+        """Reload keys, logging instead of raising so it is safe as a signal handler"""
+        try:
+            self.load()
+        except KeyLoadError as e:
+            logger.error("JWT key reload failed: %s", e)
+
+    async def start(self, client) -> None:
+        """Follow reload requests published by other workers"""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(client))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+    async def _run(self, client) -> None:
+        backoff = 1.0
+        subscribed_before = False
+        while not self._stopping.is_set():
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(KEY_RELOAD_CHANNEL)
+                # A reload may have been missed while unsubscribed
+                if subscribed_before:
+                    self.reload()
+                subscribed_before = True
+                backoff = 1.0
+                while not self._stopping.is_set():
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message["data"] != self.origin:
+                        self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("JWT key reload subscription failed", exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                await pubsub.aclose()
+
+    def signing_key(self) -> Tuple[str, Key]:
+        if self._signing is None:
+            self.load()
+        return self._signing
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key]:
+        """Return the public key for a kid; tokens without a kid use the current key"""
+        if self._signing is None:
+            self.load()
+        if kid is None:
+            return self._verification[self._signing[0]]
+        key = self._verification.get(kid)
+        if key is not None:
+            return key
+        retired = self._retired.get(kid)
+        if retired is not None and retired[1] > time.monotonic():
+            return retired[0]
+        return None
+
+    def verification_kids(self) -> List[str]:
+        now = time.monotonic()
+        return list(self._verification) + [k for k, v in self._retired.items() if v[1] > now]
+
+
+key_store = KeyStore()
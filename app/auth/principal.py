@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_INVALIDATION_CHANNEL = "principal:invalidated"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by the request handlers"""
+    id: UUID
+    role: str
+    group_id: Optional[UUID]
+
+
+class PrincipalCache:
+    """Bounded LRU cache of principals with a per-entry TTL.
+
+    Entries are dropped when a user is updated or deleted. Once start() has
+    been called, invalidations from other workers arrive over the Redis
+    pub/sub channel, and the cache is bypassed whenever that subscription
+    is down so a demoted or deleted user never keeps stale rights.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation so a lookup that raced one is not cached
+        self.generation = 0
+        self._entries: "OrderedDict[UUID, Tuple[Principal, float]]" = OrderedDict()
+        self._shared = False
+        self._live = False
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def get(self, user_id: UUID) -> Optional[Principal]:
+        if self._shared and not self._live:
+            self.misses += 1
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, principal: Principal, generation: Optional[int] = None) -> None:
+        """Cache a principal; skipped if an invalidation happened since ``generation``"""
+        if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self.generation += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    async def start(self, client) -> None:
+        """Follow invalidations published by other workers"""
+        if self._task is None:
+            self._shared = True
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(client))
+
+    async def stop(self) -> None:
+        self._live = False
+        if self._task is not None:
+            self._stopping.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+    async def _run(self, client) -> None:
+        backoff = 1.0
+        while not self._stopping.is_set():
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(PRINCIPAL_INVALIDATION_CHANNEL)
+                # Invalidations may have been missed while unsubscribed
+                self.clear()
+                self._live = True
+                backoff = 1.0
+                while not self._stopping.is_set():
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.invalidate(UUID(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._live = False
+                logger.warning("Principal cache sync failed; bypassing the cache", exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                await pubsub.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "synced": self._live or not self._shared,
+        }
+
+
+principal_cache = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
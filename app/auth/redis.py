@@ -1,10 +1,37 @@
-import redis
+import logging
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 from app.config import settings
 from typing import Optional
-import json
+from uuid import UUID
+
+from .keys import KEY_RELOAD_CHANNEL, key_store
+from .principal import PRINCIPAL_INVALIDATION_CHANNEL, principal_cache
+from .revocation import BLACKLIST_KEY_PREFIX, REVOCATION_CHANNEL, revocation_filter
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool; every call below is a non-blocking round trip.
+# When all connections are busy, callers wait up to redis_pool_timeout.
+redis_pool = aioredis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    decode_responses=True,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_connect_timeout,
+    health_check_interval=settings.redis_health_check_interval,
+    retry_on_timeout=True,
+)
 
 # Redis client
-redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+async def close_redis() -> None:
+    """Close the client and release pooled connections"""
+    await redis_client.aclose()
+    await redis_pool.disconnect()
 
 async def store_refresh_token(user_id: str, refresh_token: str, expires_in: int) -> None:
     """Store refresh token in Redis with expiration"""
@@ -22,12 +49,35 @@ async def delete_refresh_token(user_id: str) -> None:
     await redis_client.delete(key)
 
 async def add_token_to_blacklist(jti: str, expires_in: int) -> None:
-    """Add token to blacklist with expiration"""
-    key = f"blacklist:{jti}"
-    await redis_client.setex(key, expires_in, "true")
+    """Add token to blacklist with expiration and notify the other workers"""
+    key = f"{BLACKLIST_KEY_PREFIX}{jti}"
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.setex(key, expires_in, "true")
+        pipe.publish(REVOCATION_CHANNEL, jti)
+        await pipe.execute()
+    revocation_filter.add(jti)
+
+async def invalidate_principal(user_id: UUID) -> None:
+    """Drop a cached principal in this worker and tell the other workers to do the same"""
+    principal_cache.invalidate(user_id)
+    try:
+        await redis_client.publish(PRINCIPAL_INVALIDATION_CHANNEL, str(user_id))
+    except RedisError:
+        # Workers whose subscription is down bypass their cache; the others
+        # keep the entry until its TTL expires
+        logger.warning("Failed to publish principal invalidation for %s", user_id, exc_info=True)
+
+async def publish_key_reload() -> None:
+    """Tell the other workers to reload their JWT keys from disk"""
+    try:
+        await redis_client.publish(KEY_RELOAD_CHANNEL, key_store.origin)
+    except RedisError:
+        logger.warning("Failed to publish JWT key reload", exc_info=True)
 
 async def is_token_blacklisted(jti: str) -> bool:
-    """Check if token is blacklisted"""
-    key = f"blacklist:{jti}"
+    """Check if token is blacklisted; Redis is only asked on a possible filter hit"""
+    if not revocation_filter.might_contain(jti):
+        return False
+    key = f"{BLACKLIST_KEY_PREFIX}{jti}"
     result = await redis_client.get(key)
     return result is not None
\ No newline at end of file
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_KEY_PREFIX = "blacklist:"
+REVOCATION_CHANNEL = "blacklist:revoked"
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationFilter:
+    """Per-worker bloom filter of revoked token ids.
+
+    The filter is seeded from the ``blacklist:*`` keys in Redis and kept
+    current through the revocation pub/sub channel. It is rebuilt
+    periodically so expired entries drop out. A negative answer is only
+    trusted while the subscription is live; otherwise every lookup falls
+    through to Redis.
+    """
+
+    def __init__(self) -> None:
+        self._filter = self._new_filter()
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(settings.revocation_filter_capacity, settings.revocation_filter_error_rate)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def might_contain(self, jti: str) -> bool:
+        if not self._ready:
+            return True
+        return jti in self._filter
+
+    def add(self, jti: str) -> None:
+        self._filter.add(jti)
+
+    async def start(self, client) -> None:
+        if settings.revocation_filter_enabled and self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(client))
+
+    async def stop(self) -> None:
+        self._ready = False
+        if self._task is not None:
+            self._stopping.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+    async def _rebuild(self, client) -> None:
+        rebuilt = self._new_filter()
+        async for key in client.scan_iter(match=f"{BLACKLIST_KEY_PREFIX}*", count=1000):
+            rebuilt.add(key[len(BLACKLIST_KEY_PREFIX):])
+        self._filter = rebuilt
+
+    async def _run(self, client) -> None:
+        backoff = 1.0
+        while not self._stopping.is_set():
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before scanning so revocations made during the
+                # scan are queued on the channel rather than lost.
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                await self._rebuild(client)
+                self._ready = True
+                backoff = 1.0
+                next_rebuild = time.monotonic() + settings.revocation_filter_rebuild_seconds
+                while not self._stopping.is_set():
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._filter.add(message["data"])
+                    if time.monotonic() >= next_rebuild:
+                        await self._rebuild(client)
+                        next_rebuild = time.monotonic() + settings.revocation_filter_rebuild_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._ready = False
+                logger.warning("Revocation filter sync failed; falling back to Redis lookups", exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                await pubsub.aclose()
+
+
+revocation_filter = RevocationFilter()
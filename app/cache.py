@@ -0,0 +1,146 @@
+"""Redis-backed response cache with version-key invalidation.
+
+Every cache entry key embeds the current token of a version key. Writers
+replace the token after committing, which makes every entry built from
+the old token unreachable at once; the entries themselves expire through
+their TTL. Versions are random tokens rather than counters so a version
+key lost to eviction can never come back with a value that was used
+before.
+"""
+import asyncio
+import json
+import logging
+import secrets
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from app.auth.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "cache:version:"
+ENTRY_KEY_PREFIX = "cache:entry:"
+
+
+class ResponseCache:
+    """Cache of JSON-compatible endpoint results, shared through Redis.
+
+    Concurrent misses for the same key in this process wait for a single
+    computation instead of each querying the database.
+    """
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get_version(self, name: str) -> str:
+        key = f"{VERSION_KEY_PREFIX}{name}"
+        version = await self._client.get(key)
+        if version is None:
+            await self._client.set(key, secrets.token_hex(8), nx=True)
+            version = await self._client.get(key)
+        return version
+
+    async def bump(self, *names: str) -> None:
+        """Replace the given version tokens, orphaning entries built on them"""
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for name in names:
+                    pipe.set(f"{VERSION_KEY_PREFIX}{name}", secrets.token_hex(8))
+                await pipe.execute()
+        except RedisError:
+            self.errors += 1
+            logger.warning("Failed to bump cache versions %s; entries expire by TTL", names, exc_info=True)
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        version_name: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+    ) -> Any:
+        """Return the cached result for the key, computing and storing it on a miss.
+
+        ``compute`` runs as a task shared with coalesced callers and may
+        outlive the request that started it, so it must not use
+        request-scoped resources such as the request's database session.
+        """
+        try:
+            version = await self.get_version(version_name)
+        except RedisError:
+            self.errors += 1
+            logger.warning("Response cache unavailable; computing %s directly", endpoint, exc_info=True)
+            return await compute()
+
+        query = urlencode(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        key = f"{ENTRY_KEY_PREFIX}{endpoint}:{version_name}:{version}:{query}"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.ensure_future(self._load(key, compute, ttl))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        try:
+            cached = await self._client.get(key)
+        except RedisError:
+            self.errors += 1
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        result = jsonable_encoder(await compute())
+        try:
+            await self._client.setex(key, ttl, json.dumps(result))
+        except RedisError:
+            self.errors += 1
+            logger.warning("Failed to store response cache entry %s", key, exc_info=True)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+
+response_cache = ResponseCache(redis_client)
+
+
+def statistics_version(group_id: Optional[UUID] = None) -> str:
+    """Version name for all statistics (admin scope) or one group's (SV scope)"""
+    return "statistics" if group_id is None else f"statistics:group:{group_id}"
+
+
+async def invalidate_statistics(*group_ids: UUID) -> None:
+    """Mark admin statistics and those of the given groups as stale"""
+    await response_cache.bump(statistics_version(), *(statistics_version(g) for g in group_ids))
+
+
+def table_version(table: str) -> str:
+    """Version name for the rows of a reference table"""
+    return f"table:{table}"
+
+
+async def invalidate_table(table: str) -> None:
+    """Mark every cached representation of a reference table as stale"""
+    await response_cache.bump(table_version(table))
@@ -0,0 +1,53 @@
+"""Conditional GET for reference data.
+
+ETags are derived from a per-table version token kept in Redis (see
+app.cache.table_version) plus the request path and query, so a matching
+If-None-Match is answered with 304 before the handler runs and without
+reading any rows. Admin writes replace the token via invalidate_table().
+"""
+import hashlib
+import logging
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from app.cache import response_cache, table_version
+
+logger = logging.getLogger(__name__)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_get(table: str) -> Callable:
+    """Dependency that sets a strong ETag and answers a matching If-None-Match with 304.
+
+    It returns the headers it set (None without Redis) for handlers that
+    build their own Response.
+    """
+
+    async def dependency(request: Request, response: Response) -> Optional[Dict[str, str]]:
+        try:
+            version = await response_cache.get_version(table_version(table))
+        except RedisError:
+            logger.warning("ETag version for %s unavailable; serving without ETag", table, exc_info=True)
+            return None
+
+        query = urlencode(sorted(request.query_params.multi_items()))
+        digest = hashlib.sha256(f"{version}:{request.url.path}?{query}".encode()).hexdigest()[:32]
+        etag = f'"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        return headers
+
+    return dependency
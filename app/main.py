@@ -1,12 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import logging
+import secrets
+import signal
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.database import engine, get_pool_stats
 from app.api.v1 import api_router
+from app.cache import response_cache
+from app.auth.keys import key_store
+from app.auth.password import shutdown_password_pool
+from app.auth.principal import principal_cache
+from app.auth.redis import close_redis, publish_key_reload, redis_client
+from app.auth.revocation import revocation_filter
+from app.middleware import (
+    CompressionMiddleware, MetricsMiddleware, QueryStatsMiddleware, compression_stats, instrument_engine, render_metrics
+)
+
+logger = logging.getLogger(__name__)
+
+
+_background_tasks = set()
+
+
+def _reload_keys_everywhere() -> None:
+    """Reload JWT keys in this worker and ask the other workers to follow"""
+    key_store.reload()
+    task = asyncio.create_task(publish_key_reload())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _install_signal_handlers() -> None:
+    """Reload JWT keys on SIGHUP where the platform supports it"""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_keys_everywhere)
+    except (NotImplementedError, RuntimeError):
+        logger.warning("SIGHUP key reload is not available in this process")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    key_store.reload()
+    _install_signal_handlers()
+    await key_store.start(redis_client)
+    await revocation_filter.start(redis_client)
+    await principal_cache.start(redis_client)
+    yield
+    await principal_cache.stop()
+    await revocation_filter.stop()
+    await key_store.stop()
+    await close_redis()
+    await engine.dispose()
+    shutdown_password_pool()
+
 
 app = FastAPI(
     title="Knowledge Maintenance API",
     description="ナレッジメンテナンスサイト バックエンドAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -18,6 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression of buffered responses (streaming exports pass through)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Per-request query count and DB time, slow query and N+1 logging
+instrument_engine(engine.sync_engine)
+app.add_middleware(QueryStatsMiddleware)
+
+# Outermost, so recorded latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -27,4 +97,50 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+async def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Require METRICS_TOKEN as a bearer token when one is configured"""
+    if not settings.metrics_token:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.metrics_token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+metrics_router = APIRouter(prefix="/metrics", dependencies=[Depends(require_metrics_token)])
+
+@metrics_router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, pool and cache metrics in Prometheus text format"""
+    return PlainTextResponse(
+        render_metrics([
+            ("db_pool", "Database connection pool", get_pool_stats),
+            ("auth_cache", "Authenticated principal cache", principal_cache.stats),
+            ("response_cache", "Statistics response cache", response_cache.stats),
+        ]),
+        media_type="text/plain; version=0.0.4",
+    )
+
+@metrics_router.get("/db-pool")
+async def db_pool_metrics():
+    return get_pool_stats()
+
+
+@metrics_router.get("/auth-cache")
+async def auth_cache_metrics():
+    return principal_cache.stats()
+
+@metrics_router.get("/response-cache")
+async def response_cache_metrics():
+    return response_cache.stats()
+
+
+@metrics_router.get("/compression")
+async def compression_metrics():
+    return compression_stats.stats()
+
+app.include_router(metrics_router)
@@ -0,0 +1,14 @@
+from .compression import CompressionMiddleware, compression_stats
+from .metrics import MetricsMiddleware, render_metrics, request_metrics
+from .query_stats import QueryStatsMiddleware, current_query_stats, instrument_engine
+
+__all__ = [
+    "CompressionMiddleware",
+    "compression_stats",
+    "MetricsMiddleware",
+    "render_metrics",
+    "request_metrics",
+    "QueryStatsMiddleware",
+    "current_query_stats",
+    "instrument_engine"
+]
@@ -0,0 +1,171 @@
+"""gzip / brotli compression for buffered responses.
+
+Only responses sent in a single body message (regular JSON responses)
+are compressed. Streaming responses such as exports and bulk import
+progress pass through untouched, as do responses that already carry a
+Content-Encoding and bodies below the configured minimum size. brotli is
+used when the ``brotli`` package is installed and the client prefers it.
+"""
+import gzip
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Bodies at least this large are compressed in a worker thread so a
+# multi-megabyte list does not stall the event loop
+THREAD_OFFLOAD_SIZE = 64 * 1024
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    compressors = {
+        "gzip": lambda body: gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0),
+    }
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=settings.compression_brotli_quality)
+    return compressors
+
+
+def _accepted(accept_encoding: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Best available coding the client accepts; brotli wins ties"""
+    accepted = _accepted(accept_encoding)
+    best, best_q = None, 0.0
+    for coding in sorted(available, key=lambda c: c != "br"):
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionStats:
+    """Per-route bytes and CPU time spent compressing, for /metrics/compression"""
+
+    def __init__(self) -> None:
+        self.routes: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(
+            lambda: {"responses": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0}
+        )
+        self.skipped = 0
+
+    def record(self, route: str, encoding: str, bytes_in: int, bytes_out: int, seconds: float) -> None:
+        entry = self.routes[(route, encoding)]
+        entry["responses"] += 1
+        entry["bytes_in"] += bytes_in
+        entry["bytes_out"] += bytes_out
+        entry["seconds"] += seconds
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "available_encodings": list(_compressors()),
+            "skipped": self.skipped,
+            "routes": [
+                {
+                    "route": route,
+                    "encoding": encoding,
+                    **entry,
+                    "ratio": round(entry["bytes_out"] / entry["bytes_in"], 4) if entry["bytes_in"] else None,
+                }
+                for (route, encoding), entry in sorted(self.routes.items())
+            ],
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """Compress buffered responses with the best coding the client accepts"""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None) -> None:
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.compressors = _compressors()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.compressors))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start_message)
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+            ):
+                # Streaming, already encoded or too small to be worth it
+                passthrough = True
+                compression_stats.skipped += 1
+                await send(start_message)
+                await send(message)
+                return
+
+            started = time.perf_counter()
+            compress = self.compressors[encoding]
+            if len(body) >= THREAD_OFFLOAD_SIZE:
+                compressed = await anyio.to_thread.run_sync(compress, body)
+            else:
+                compressed = compress(body)
+            compression_stats.record(
+                getattr(scope.get("route"), "path", UNMATCHED_ROUTE), encoding, len(body), len(compressed),
+                time.perf_counter() - started,
+            )
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The compressed bytes differ from the identity representation
+                headers["ETag"] = f"W/{etag}"
+            message["body"] = compressed
+            passthrough = True
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
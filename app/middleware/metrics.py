@@ -0,0 +1,161 @@
+"""Per-route request metrics in Prometheus text format.
+
+Latency histograms and status counters are labelled by method and route
+template (``/api/v1/proposals/{proposal_id}``), never by the raw path,
+so label cardinality stays bounded. Requests that match no route share
+the ``<unmatched>`` label. Recording is a few dict operations per
+request on the event loop thread, so no locking is needed; like the
+other /metrics endpoints the values are per worker process.
+"""
+import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Stats keys that only ever grow; everything else is exported as a gauge
+COUNTER_KEYS = {
+    "hits", "misses", "coalesced", "errors", "checkouts", "timeouts", "wait_seconds_total", "skipped",
+}
+
+Labels = Tuple[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestMetrics:
+    """Latency histograms, status counts, in-flight gauge and budget breaches"""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # (method, route) -> per-bucket counts, the last slot being +Inf
+        self.bucket_counts: Dict[Labels, List[int]] = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self.latency_sum: Dict[Labels, float] = defaultdict(float)
+        self.responses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.budget_exceeded: Dict[Labels, int] = defaultdict(int)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+
+    def budget_for(self, method: str, route: str) -> float:
+        return settings.latency_budgets.get(f"{method} {route}", settings.latency_budget_seconds)
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route)
+        self.bucket_counts[key][bisect_left(self.buckets, seconds)] += 1
+        self.latency_sum[key] += seconds
+        self.responses[(method, route, status_code)] += 1
+        if route != UNMATCHED_ROUTE and seconds > self.budget_for(method, route):
+            self.budget_exceeded[key] += 1
+            if settings.log_latency_budget_breaches:
+                logger.warning(
+                    "%s %s took %.3fs (budget %.3fs, status %d)",
+                    method, route, seconds, self.budget_for(method, route), status_code,
+                )
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route template",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), counts in sorted(self.bucket_counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{labels} {self.latency_sum[(method, route)]!r}")
+            lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+        lines += [
+            "# HELP http_responses_total Responses by route template and status code",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route, status_code), count in sorted(self.responses.items()):
+            lines.append(f"http_responses_total{_labels(method=method, route=route, status=status_code)} {count}")
+
+        lines += [
+            "# HELP http_request_budget_exceeded_total Requests slower than their latency budget",
+            "# TYPE http_request_budget_exceeded_total counter",
+        ]
+        for (method, route), count in sorted(self.budget_exceeded.items()):
+            lines.append(f"http_request_budget_exceeded_total{_labels(method=method, route=route)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, count in sorted(self.in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method=method)} {count}")
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """Time every HTTP request and record it under its route template"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+        request_metrics.in_flight[method] += 1
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.in_flight[method] -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            request_metrics.observe(method, route, status_code, time.perf_counter() - started)
+
+
+def stats_lines(prefix: str, help_text: str, stats: Dict[str, Any]) -> List[str]:
+    """Export the numeric values of a stats() dict as ``<prefix>_<key>`` samples"""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        kind = "counter" if key in COUNTER_KEYS else "gauge"
+        lines += [f"# HELP {name} {help_text} ({key})", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+    return lines
+
+
+def render_metrics(sources: Iterable[Tuple[str, str, Callable[[], Dict[str, Any]]]]) -> str:
+    """Prometheus text exposition of request metrics plus the given (prefix, help, stats) sources"""
+    lines = request_metrics.render()
+    for prefix, help_text, stats in sources:
+        lines += stats_lines(prefix, help_text, stats())
+    return "\n".join(lines) + "\n"
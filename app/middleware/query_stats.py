@@ -0,0 +1,119 @@
+"""Per-request SQL instrumentation.
+
+Engine events count the queries each request runs and the time spent in
+them. The stats live in a ContextVar set by QueryStatsMiddleware;
+SQLAlchemy's async layer runs the sync engine events in greenlets that
+share the calling task's context, so the events see the request they
+belong to. Outside production the totals go out in a Server-Timing
+header. Slow statements are logged with the route that issued them, and
+a statement repeated more than ``n_plus_one_threshold`` times in one
+request is logged once as a likely N+1.
+"""
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_LENGTH = 500
+
+
+class RequestQueryStats:
+    """Queries, database time and statement repeats for one request"""
+
+    def __init__(self, scope: Scope) -> None:
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', self.scope['path'])}"
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        # Bound parameters are placeholders, so the text is the statement's shape
+        self.statements[statement] += 1
+        repeats = self.statements[statement]
+        if repeats == settings.n_plus_one_threshold + 1:
+            logger.warning(
+                "Possible N+1 in %s: statement ran %d times in one request: %s",
+                self.route, repeats, statement[:STATEMENT_LOG_LENGTH],
+            )
+        if seconds * 1000 >= settings.slow_query_threshold_ms:
+            logger.warning(
+                "Slow query in %s (%.1f ms): %s",
+                self.route, seconds * 1000, statement[:STATEMENT_LOG_LENGTH],
+            )
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the query counting hooks to a (sync) engine"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Collect SQL stats per request and report them in Server-Timing outside production"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.server_timing = settings.environment != "production"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if self.server_timing and message["type"] == "http.response.start":
+                # Streaming bodies may query after this point; only what ran so far is reported
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
@@ -4,6 +4,7 @@ from .info_category import InfoCategory
 from .article import Article
 from .proposal import Proposal
 from .proposal_before import ProposalBefore
+from .proposal_statistic import ProposalStatistic
 
 __all__ = [
     "User",
@@ -11,5 +12,6 @@ __all__ = [
     "InfoCategory",
     "Article",
     "Proposal",
-    "ProposalBefore"
+    "ProposalBefore",
+    "ProposalStatistic"
 ]
\ No newline at end of file
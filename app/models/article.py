@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMPTZ
+from sqlalchemy import Column, FetchedValue, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -12,9 +12,13 @@ class Article(Base):
     article_id = Column(String(50), nullable=False, unique=True)
     article = Column(String(255), nullable=False, unique=True)
     approval_group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
-    created_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), server_onupdate=FetchedValue())
+    
+    __table_args__ = (
+        Index("idx_articles_approval_group", "approval_group_id"),
+    )
     
     # Relationships
     approval_group = relationship("Group", back_populates="articles")
-    proposals = relationship("Proposal", back_populates="article")
\ No newline at end of file
+    proposals = relationship("Proposal", back_populates="article_ref")
\ No newline at end of file
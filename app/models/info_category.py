@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMPTZ
+from sqlalchemy import Column, FetchedValue, String, Text
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -11,8 +11,8 @@ class InfoCategory(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), server_onupdate=FetchedValue())
     
     # Relationships
     proposals = relationship("Proposal", back_populates="info_category")
@@ -1,9 +1,31 @@
-from sqlalchemy import Column, String, Text, Boolean, Date, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMPTZ
+from sqlalchemy import Column, FetchedValue, String, Text, Boolean, Date, ForeignKey, CheckConstraint, Index, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, TIMESTAMP
 from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# Text searched by /proposals/search. Queries must use this exact expression
+# (see search_document()) for PostgreSQL to match it to the trigram index.
+SEARCH_DOCUMENT_SQL = (
+    "(coalesce(title, '') || ' ' || coalesce(keywords, '') || ' ' || coalesce(question, '')"
+    " || ' ' || coalesce(answer, '') || ' ' || coalesce(add_comments, ''))"
+)
+
+
+def search_document():
+    return literal_column(SEARCH_DOCUMENT_SQL, type_=Text)
+
+
+# pg_trgm extracts no trigrams from 1-2 character LIKE patterns (typical
+# Japanese terms such as 申請), so those are looked up in an index over the
+# document's lowercased unigrams and bigrams instead. The function is
+# created by migration 0007.
+SHORT_NGRAMS_SQL = f"proposal_short_ngrams({SEARCH_DOCUMENT_SQL})"
+
+
+def short_ngrams():
+    return literal_column(SHORT_NGRAMS_SQL, type_=ARRAY(Text))
+
 
 class Proposal(Base):
     __tablename__ = "proposals"
@@ -27,10 +49,10 @@ class Proposal(Base):
     reason = Column(Text, nullable=False)
     approval_group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
     approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    approved_at = Column(TIMESTAMPTZ, nullable=True)
+    approved_at = Column(TIMESTAMP(timezone=True), nullable=True)
     rejection_reason = Column(Text, nullable=True)
-    created_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), server_onupdate=FetchedValue())
     
     # Check constraints
     __table_args__ = (
@@ -41,6 +63,26 @@ class Proposal(Base):
             "(status != '却下') OR (status = '却下' AND rejection_reason IS NOT NULL AND rejection_reason != '')",
             name="chk_rejection_reason"
         ),
+        # Keyset pagination sort key for proposal lists
+        Index("idx_proposals_created_at_id", "created_at", "id"),
+        # Per-user monthly statistics
+        Index("idx_proposals_user_created_at", "user_id", "created_at"),
+        # Pending-approval queue per group, in list order
+        Index("idx_proposals_approval_group_status", "approval_group_id", "status", "created_at", "id"),
+        # SV monthly trends (approval_group_id, created_at range)
+        Index("idx_proposals_approval_group_created_at", "approval_group_id", "created_at"),
+        # Admin pending-approval queue and status filters, in list order
+        Index("idx_proposals_status_created_at", "status", "created_at", "id"),
+        Index("idx_proposals_article_id", "article_id"),
+        # Substring search over the text fields (requires pg_trgm)
+        Index(
+            "idx_proposals_search_trgm",
+            search_document().label("search_document"),
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ),
+        # Search terms shorter than three characters
+        Index("idx_proposals_search_short_ngrams", short_ngrams(), postgresql_using="gin"),
     )
     
     # Relationships
@@ -49,4 +91,4 @@ class Proposal(Base):
     info_category = relationship("InfoCategory", back_populates="proposals")
     approval_group = relationship("Group", back_populates="proposals")
     approver = relationship("User", back_populates="approved_proposals", foreign_keys=[approved_by])
-    proposal_before = relationship("ProposalBefore", back_populates="proposal", uselist=False)
\ No newline at end of file
+    proposal_before = relationship("ProposalBefore", back_populates="proposal", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Boolean, Date, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMPTZ
+from sqlalchemy import Column, String, Text, Boolean, Date, ForeignKey, CheckConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -20,11 +20,12 @@ class ProposalBefore(Base):
     question_before = Column(Text, nullable=True)
     answer_before = Column(Text, nullable=True)
     add_comments_before = Column(Text, nullable=True)
-    created_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
     
     # Check constraints
     __table_args__ = (
         CheckConstraint("target_before IN ('社内向け', '社外向け', '該当なし') OR target_before IS NULL", name="chk_target_before"),
+        Index("idx_proposals_before_proposal_id", "proposal_id"),
     )
     
     # Relationships
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer, Date, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class ProposalStatistic(Base):
+    """Proposal counts per (group, user, month, type, status), kept in step with proposals"""
+    __tablename__ = "proposal_statistics"
+
+    approval_group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    # First day of the month in settings.business_timezone
+    month = Column(Date, primary_key=True)
+    type = Column(String(10), primary_key=True)
+    status = Column(String(10), primary_key=True)
+    proposal_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Per-user statistics; group statistics use the primary key prefix
+        Index("idx_proposal_statistics_user_month", "user_id", "month"),
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMPTZ
+from sqlalchemy import Column, FetchedValue, String, ForeignKey, CheckConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -14,12 +14,14 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     role = Column(String(20), nullable=False)
     group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=True)
-    created_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(TIMESTAMPTZ, server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), server_onupdate=FetchedValue())
     
     # Check constraints
     __table_args__ = (
         CheckConstraint("role IN ('一般ユーザー', 'SV', '管理者')", name="chk_user_role"),
+        Index("idx_users_group_id", "group_id"),
+        Index("idx_users_role", "role"),
     )
     
     # Relationships
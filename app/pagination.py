@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from uuid import UUID
+import base64
+import json
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.responses import FastJSONResponse, page_response, row_items, schema_columns
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last returned row"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor back into values typed like the sort columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        values = []
+        for column, value in zip(columns, raw):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def apply_keyset(
+    query: Select,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Order by the sort key, seek past the cursor and fetch one extra row.
+
+    The row-value comparison lets PostgreSQL walk a matching composite
+    index instead of sorting and skipping rows.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        query = query.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    order = [c.desc() for c in columns] if descending else list(columns)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], columns: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by apply_keyset and build the next cursor"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return items, next_cursor
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Parse a comma separated ``fields=`` selector; ``id`` is always included"""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+async def paginate(
+    db: AsyncSession,
+    model: Any,
+    schema: Type[BaseModel],
+    sort_key: Sequence[Any],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> FastJSONResponse:
+    """Return one keyset page of ``model`` rows.
+
+    Only the columns of ``schema`` (or of ``fields``, plus the sort key)
+    are selected, and the rows are serialized with orjson without going
+    through ORM objects or response_model validation; ``headers`` are
+    added to the response.
+    """
+    selected = parse_fields(fields, schema) or list(schema.model_fields)
+    columns = schema_columns(model, schema, selected)
+    columns += [c for c in sort_key if c.key not in selected]
+    result = await db.execute(apply_keyset(select(*columns), sort_key, cursor, limit))
+    rows, next_cursor = split_page(result.all(), sort_key, limit)
+    return page_response(row_items(rows, selected), next_cursor, headers)
@@ -0,0 +1,42 @@
+"""orjson-based responses for list endpoints that serialize Core rows directly.
+
+Routes opt in by returning ``FastJSONResponse`` with plain dicts built from
+``select(*columns)`` rows. This skips ORM hydration, response_model
+validation and jsonable_encoder; the selected columns must already match
+the documented response schema, which ``schema_columns`` guarantees.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse rendering UTC datetimes with a Z suffix, as Pydantic does"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def schema_columns(model: Any, schema: Type[BaseModel], fields: Optional[Sequence[str]] = None) -> List[Any]:
+    """Model columns for the schema's fields (or the given subset), in schema order"""
+    return [getattr(model, f) for f in (fields if fields is not None else schema.model_fields)]
+
+
+def row_items(
+    rows: Sequence[Any],
+    fields: Sequence[str],
+    defaults: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Turn Core rows into response dicts holding only ``fields`` plus ``defaults``"""
+    defaults = defaults or {}
+    return [{**{f: getattr(row, f) for f in fields}, **defaults} for row in rows]
+
+
+def page_response(
+    items: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> FastJSONResponse:
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor}, headers=headers)
@@ -1,15 +1,24 @@
-from .user import UserCreate, UserUpdate, UserResponse, LoginRequest, TokenResponse
-from .group import GroupCreate, GroupUpdate, GroupResponse
-from .info_category import InfoCategoryCreate, InfoCategoryUpdate, InfoCategoryResponse
+from .user import UserCreate, UserUpdate, UserResponse, UserSummary, LoginRequest, TokenResponse
+from .group import GroupCreate, GroupUpdate, GroupResponse, GroupSummary
+from .info_category import InfoCategoryCreate, InfoCategoryUpdate, InfoCategoryResponse, InfoCategorySummary
 from .article import ArticleCreate, ArticleUpdate, ArticleResponse
-from .proposal import ProposalCreate, ProposalUpdate, ProposalResponse, ProposalApprovalRequest
+from .proposal import (
+    ProposalCreate, ProposalUpdate, ProposalResponse, ProposalApprovalRequest,
+    ProposalBatchApprovalRequest, ProposalBatchResult, ProposalBatchApprovalResponse, ProposalSearchResult,
+    ProposalBeforeValues, ProposalFieldChange, ProposalDiff, ProposalExpandedResponse
+)
 from .proposal_before import ProposalBeforeResponse
+from .pagination import Page
 
 __all__ = [
-    "UserCreate", "UserUpdate", "UserResponse", "LoginRequest", "TokenResponse",
-    "GroupCreate", "GroupUpdate", "GroupResponse",
-    "InfoCategoryCreate", "InfoCategoryUpdate", "InfoCategoryResponse",
+    "UserCreate", "UserUpdate", "UserResponse", "UserSummary", "LoginRequest", "TokenResponse",
+    "GroupCreate", "GroupUpdate", "GroupResponse", "GroupSummary",
+    "InfoCategoryCreate", "InfoCategoryUpdate", "InfoCategoryResponse", "InfoCategorySummary",
     "ArticleCreate", "ArticleUpdate", "ArticleResponse",
     "ProposalCreate", "ProposalUpdate", "ProposalResponse", "ProposalApprovalRequest",
-    "ProposalBeforeResponse"
+    "ProposalBatchApprovalRequest", "ProposalBatchResult", "ProposalBatchApprovalResponse",
+    "ProposalSearchResult", "ProposalBeforeValues", "ProposalFieldChange", "ProposalDiff",
+    "ProposalExpandedResponse",
+    "ProposalBeforeResponse",
+    "Page"
 ]
\ No newline at end of file
@@ -19,4 +19,12 @@ class GroupResponse(BaseModel):
     description: Optional[str]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class GroupSummary(BaseModel):
+    id: UUID
+    name: str
+
+    class Config:
+        from_attributes = True
@@ -22,4 +22,12 @@ class InfoCategoryResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class InfoCategorySummary(BaseModel):
+    id: UUID
+    name: str
+
+    class Config:
+        from_attributes = True
@@ -1,8 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 from datetime import datetime, date
 from uuid import UUID
 from enum import Enum
+from .user import UserSummary
+from .group import GroupSummary
+from .info_category import InfoCategorySummary
 
 
 class ProposalType(str, Enum):
@@ -22,6 +25,20 @@ class ProposalTarget(str, Enum):
     NOT_APPLICABLE = "該当なし"
 
 
+class ProposalBeforeValues(BaseModel):
+    """The article's current values, as shown to the proposer"""
+    title: Optional[str] = None
+    info_category_id: Optional[UUID] = None
+    keywords: Optional[str] = None
+    importance: Optional[bool] = None
+    published_start: Optional[date] = None
+    published_end: Optional[date] = None
+    target: Optional[ProposalTarget] = None
+    question: Optional[str] = None
+    answer: Optional[str] = None
+    add_comments: Optional[str] = None
+
+
 class ProposalCreate(BaseModel):
     article_id: str
     article: str
@@ -37,6 +54,8 @@ class ProposalCreate(BaseModel):
     answer: Optional[str] = None
     add_comments: Optional[str] = None
     reason: str
+    # Snapshot for proposals_before; defaults to the last approved revision of the article
+    before: Optional[ProposalBeforeValues] = None
 
 
 class ProposalUpdate(BaseModel):
@@ -58,6 +77,23 @@ class ProposalApprovalRequest(BaseModel):
     rejection_reason: Optional[str] = None
 
 
+class ProposalBatchApprovalRequest(ProposalApprovalRequest):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class ProposalBatchResult(BaseModel):
+    id: UUID
+    success: bool
+    detail: Optional[str] = None
+
+
+class ProposalBatchApprovalResponse(BaseModel):
+    status: ProposalStatus
+    succeeded: int
+    failed: int
+    results: List[ProposalBatchResult]
+
+
 class ProposalResponse(BaseModel):
     id: UUID
     user_id: UUID
@@ -84,4 +120,31 @@ class ProposalResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ProposalExpandedResponse(ProposalResponse):
+    """ProposalResponse with the related records requested through expand="""
+    user: Optional[UserSummary] = None
+    approval_group: Optional[GroupSummary] = None
+    info_category: Optional[InfoCategorySummary] = None
+    approver: Optional[UserSummary] = None
+
+
+class ProposalSearchResult(ProposalResponse):
+    rank: float
+    highlights: Dict[str, str] = {}
+
+
+class ProposalFieldChange(BaseModel):
+    field: str
+    before: Any = None
+    after: Any = None
+
+
+class ProposalDiff(BaseModel):
+    proposal_id: UUID
+    type: ProposalType
+    status: ProposalStatus
+    has_snapshot: bool
+    changes: List[ProposalFieldChange]
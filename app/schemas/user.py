@@ -39,6 +39,14 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    id: UUID
+    username: str
+
+    class Config:
+        from_attributes = True
+
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -0,0 +1,55 @@
+"""proposals_before snapshots and before/after diffs"""
+from typing import Any, Dict, Mapping
+
+from sqlalchemy import select
+
+from app.models.article import Article
+from app.models.proposal import Proposal
+from app.models.proposal_before import ProposalBefore
+
+# Proposal fields captured in proposals_before as <field>_before
+SNAPSHOT_FIELDS = [
+    "title", "info_category_id", "keywords", "importance", "published_start",
+    "published_end", "target", "question", "answer", "add_comments",
+]
+
+
+def latest_approved_revision():
+    """Lateral subquery with the last approved proposal of the outer query's article"""
+    return select(
+        Proposal.id.label("revision_id"),
+        *(getattr(Proposal, field) for field in SNAPSHOT_FIELDS)
+    ).where(
+        Proposal.article_id == Article.article_id,
+        Proposal.status == "承認済み"
+    ).order_by(
+        Proposal.approved_at.desc().nulls_last(), Proposal.created_at.desc()
+    ).limit(1).lateral("latest_approved")
+
+
+def snapshot_values(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """proposals_before column values for the given proposal field values"""
+    return {f"{field}_before": values.get(field) for field in SNAPSHOT_FIELDS}
+
+
+def snapshot(values: Mapping[str, Any]) -> ProposalBefore:
+    return ProposalBefore(**snapshot_values(values))
+
+
+def diff(proposal: Proposal) -> Dict[str, Any]:
+    """Fields whose proposed value differs from the snapshot"""
+    before = proposal.proposal_before
+    changes = []
+    if before is not None:
+        for field in SNAPSHOT_FIELDS:
+            old = getattr(before, f"{field}_before")
+            new = getattr(proposal, field)
+            if old != new:
+                changes.append({"field": field, "before": old, "after": new})
+    return {
+        "proposal_id": proposal.id,
+        "type": proposal.type,
+        "status": proposal.status,
+        "has_snapshot": before is not None,
+        "changes": changes,
+    }
@@ -0,0 +1,42 @@
+"""Streaming proposal export.
+
+Rows are read through a server-side cursor in batches of
+settings.export_batch_size and written out batch by batch, so memory use
+does not depend on the number of rows exported.
+"""
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.proposal import Proposal
+
+PROPOSAL_EXPORT_COLUMNS = list(Proposal.__table__.columns)
+
+
+def _csv_lines(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _ndjson_lines(names, rows) -> bytes:
+    # UTC datetimes with a Z suffix, as in the JSON API responses
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(dict(zip(names, row)), option=option) for row in rows)
+
+
+async def stream_proposals(query, file_format: str) -> AsyncIterator[bytes]:
+    """Yield the query's rows as CSV (with a header) or NDJSON"""
+    names = [column.name for column in PROPOSAL_EXPORT_COLUMNS]
+    if file_format == "csv":
+        yield _csv_lines([names])
+
+    # The request's session is closed once streaming starts, so use our own
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.export_batch_size))
+        async for rows in result.partitions():
+            yield _csv_lines(rows) if file_format == "csv" else _ndjson_lines(names, rows)
@@ -0,0 +1,161 @@
+"""Bulk proposal import from JSONL or CSV uploads.
+
+Rows are validated against ProposalCreate, article ids are resolved to
+approval groups in one query, and valid rows (with their before
+snapshots, when given) are inserted in chunks of multi-row INSERTs, each
+committed on its own. Progress and per-row errors
+are reported as NDJSON events.
+"""
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import String, any_, bindparam, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import DBAPIError
+
+from app.cache import invalidate_statistics
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.article import Article
+from app.models.proposal import Proposal
+from app.models.proposal_before import ProposalBefore
+from app.schemas.proposal import ProposalCreate
+from app.services import statistics_rollup
+from app.services.proposal_diff import snapshot_values
+
+# (row number, validated payload)
+ParsedRow = Tuple[int, ProposalCreate]
+
+# DictReader key for the values of a CSV row beyond its header
+EXTRA_COLUMNS = "__extra_columns__"
+
+
+def _event(**fields: Any) -> str:
+    return json.dumps(fields, ensure_ascii=False, default=str) + "\n"
+
+
+def _read_records(content: str, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (row number, raw record); JSONL rows are numbered by line, CSV rows by data row"""
+    if file_format == "csv":
+        for number, record in enumerate(csv.DictReader(io.StringIO(content), restkey=EXTRA_COLUMNS), start=1):
+            # Empty cells mean "not set" for the optional columns
+            yield number, {key: value for key, value in record.items() if value not in ("", None)}
+        return
+    for number, line in enumerate(content.splitlines(), start=1):
+        if line.strip():
+            yield number, line
+
+
+def _parse(content: str, file_format: str) -> Tuple[List[ParsedRow], List[Dict[str, Any]]]:
+    rows: List[ParsedRow] = []
+    errors: List[Dict[str, Any]] = []
+    for number, record in _read_records(content, file_format):
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            elif EXTRA_COLUMNS in record:
+                errors.append({"row": number, "detail": f"Unexpected extra columns: {len(record[EXTRA_COLUMNS])}"})
+                continue
+            rows.append((number, ProposalCreate(**record)))
+        except json.JSONDecodeError as e:
+            errors.append({"row": number, "detail": f"Invalid JSON: {e.msg}"})
+        except ValidationError as e:
+            errors.append({"row": number, "detail": e.errors(include_url=False)})
+        except TypeError:
+            errors.append({"row": number, "detail": "Row must be a JSON object"})
+    return rows, errors
+
+
+def _values(proposal_data: ProposalCreate, user_id: UUID, approval_group_id: UUID) -> Dict[str, Any]:
+    return {
+        **proposal_data.dict(exclude={"before"}),
+        "user_id": user_id,
+        "approval_group_id": approval_group_id,
+    }
+
+
+async def _insert_snapshots(db, inserted: List[Tuple[Optional[Dict[str, Any]], UUID]]) -> None:
+    """Write proposals_before rows for inserted proposals that came with before values"""
+    snapshots = [
+        {"proposal_id": proposal_id, **snapshot_values(before)}
+        for before, proposal_id in inserted if before is not None
+    ]
+    if snapshots:
+        await db.execute(insert(ProposalBefore), snapshots)
+
+
+async def import_proposals(content: str, file_format: str, user_id: UUID) -> AsyncIterator[str]:
+    """Import proposals for a user, yielding NDJSON progress, error and summary events"""
+    rows, errors = _parse(content, file_format)
+    total = len(rows) + len(errors)
+    inserted = 0
+    failed = len(errors)
+    group_ids = set()
+
+    for error in errors:
+        yield _event(event="error", **error)
+
+    async with AsyncSessionLocal() as db:
+        # Resolve every referenced article in one query
+        article_ids = list({proposal_data.article_id for _, proposal_data in rows})
+        approval_groups = dict((await db.execute(select(
+            Article.article_id, Article.approval_group_id
+        ).where(
+            Article.article_id == any_(bindparam("article_ids", article_ids, type_=ARRAY(String)))
+        ))).all()) if article_ids else {}
+
+        resolved: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        for number, proposal_data in rows:
+            approval_group_id = approval_groups.get(proposal_data.article_id)
+            if approval_group_id is None:
+                failed += 1
+                yield _event(event="error", row=number, detail="Article not found")
+            else:
+                before = proposal_data.before.dict() if proposal_data.before is not None else None
+                resolved.append((number, _values(proposal_data, user_id, approval_group_id), before))
+
+        chunk_size = settings.bulk_import_chunk_size
+        for start in range(0, len(resolved), chunk_size):
+            chunk = resolved[start:start + chunk_size]
+            try:
+                ids = (await db.scalars(
+                    insert(Proposal).returning(Proposal.id, sort_by_parameter_order=True),
+                    [values for _, values, _ in chunk],
+                )).all()
+                await _insert_snapshots(db, [(before, proposal_id) for (_, _, before), proposal_id in zip(chunk, ids)])
+                await statistics_rollup.adjust_many(db, ids, 1)
+                await db.commit()
+                inserted += len(ids)
+                group_ids.update(values["approval_group_id"] for _, values, _ in chunk)
+            except DBAPIError:
+                # A bad row (e.g. unknown info_category_id) fails the whole
+                # chunk; retry it row by row to find which ones.
+                await db.rollback()
+                for number, values, before in chunk:
+                    try:
+                        proposal_id = await db.scalar(insert(Proposal).values(**values).returning(Proposal.id))
+                        await _insert_snapshots(db, [(before, proposal_id)])
+                        await statistics_rollup.adjust(db, proposal_id, 1)
+                        await db.commit()
+                        inserted += 1
+                        group_ids.add(values["approval_group_id"])
+                    except DBAPIError as e:
+                        await db.rollback()
+                        failed += 1
+                        yield _event(event="error", row=number, detail=str(e.orig))
+            yield _event(event="progress", total=total, inserted=inserted, failed=failed)
+
+    if group_ids:
+        await invalidate_statistics(*group_ids)
+    yield _event(event="done", total=total, inserted=inserted, failed=failed)
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """Pick csv or jsonl from the upload's name or content type"""
+    if (filename or "").lower().endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    return "jsonl"
@@ -0,0 +1,74 @@
+"""Helpers for index-backed proposal search.
+
+Terms of three or more characters are matched with ILIKE through the
+pg_trgm index. Shorter terms, for which pg_trgm has no trigrams to look
+up, first go through the unigram/bigram array index and are then checked
+with ILIKE. A single very common character still matches most rows.
+"""
+import html
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import Float, Text, and_, func, literal
+from sqlalchemy.dialects.postgresql import array
+
+from app.models.proposal import search_document, short_ngrams
+
+SEARCH_FIELDS = ["title", "keywords", "question", "answer", "add_comments"]
+# Characters of context kept on each side of the first hit in a snippet
+SNIPPET_CONTEXT = 40
+# Terms shorter than this have no trigrams and use idx_proposals_search_short_ngrams
+TRIGRAM_MIN_LENGTH = 3
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a query on whitespace (including full-width spaces)"""
+    return list(dict.fromkeys(q.split()))
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+
+def _term_condition(term: str):
+    condition = search_document().ilike(_like_pattern(term), escape="/")
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        # Lowercased in SQL so the lookup folds case exactly like the index
+        condition = and_(short_ngrams().contains(array([func.lower(literal(term, Text))])), condition)
+    return condition
+
+
+def match_condition(terms: List[str]):
+    """Every term must occur in the document"""
+    return and_(*(_term_condition(term) for term in terms))
+
+
+def rank(q: str):
+    """How well the query matches the document, between 0 and 1"""
+    return func.word_similarity(q, search_document(), type_=Float).label("rank")
+
+
+def highlight(row: Any, terms: List[str]) -> Dict[str, str]:
+    """HTML-escaped snippets of the matching fields with hits wrapped in <mark>"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    highlights = {}
+    for field in SEARCH_FIELDS:
+        text = getattr(row, field)
+        if not text:
+            continue
+        first = pattern.search(text)
+        if first is None:
+            continue
+        start = max(0, first.start() - SNIPPET_CONTEXT)
+        end = min(len(text), first.end() + SNIPPET_CONTEXT)
+        snippet = text[start:end]
+        parts = []
+        last = 0
+        for match in pattern.finditer(snippet):
+            parts.append(html.escape(snippet[last:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group())}</mark>")
+            last = match.end()
+        parts.append(html.escape(snippet[last:]))
+        highlights[field] = ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+    return highlights
@@ -0,0 +1,128 @@
+"""Maintenance of the proposal_statistics rollup table.
+
+The migration that creates the table fills it from proposals; run
+``python -m app.services.statistics_rollup`` to rebuild it if it ever
+drifts.
+"""
+import asyncio
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Date, Integer, String, cast, delete, func, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.proposal import Proposal
+from app.models.proposal_statistic import ProposalStatistic
+
+ROLLUP_KEY = ["approval_group_id", "user_id", "month", "type", "status"]
+
+
+def month_of(created_at):
+    """First day of the business-timezone month containing a timestamp"""
+    return cast(func.date_trunc("month", func.timezone(settings.business_timezone, created_at)), Date)
+
+
+def _upsert(rows):
+    stmt = insert(ProposalStatistic).from_select(ROLLUP_KEY + ["proposal_count"], rows)
+    return stmt.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={"proposal_count": ProposalStatistic.proposal_count + stmt.excluded.proposal_count},
+    )
+
+
+async def _apply(db: AsyncSession, rows) -> None:
+    """Upsert deltas and drop the rows they bring to zero.
+
+    Leftover zero rows would keep referencing users and groups whose
+    proposals are all gone and block deleting them.
+    """
+    key = [getattr(ProposalStatistic, k) for k in ROLLUP_KEY]
+    result = await db.execute(_upsert(rows).returning(*key, ProposalStatistic.proposal_count))
+    emptied = [tuple(row)[:-1] for row in result if row.proposal_count == 0]
+    if emptied:
+        await db.execute(delete(ProposalStatistic).where(
+            tuple_(*key).in_(emptied),
+            ProposalStatistic.proposal_count == 0,
+        ))
+
+
+async def adjust(db: AsyncSession, proposal_id: UUID, delta: int) -> None:
+    """Add `delta` to the rollup row matching the proposal's current state.
+
+    Call with -1 before changing or deleting a proposal and with +1 after
+    it has been flushed, inside the same transaction.
+    """
+    await _apply(db, select(
+        Proposal.approval_group_id,
+        Proposal.user_id,
+        month_of(Proposal.created_at),
+        Proposal.type,
+        Proposal.status,
+        literal(delta, Integer),
+    ).where(Proposal.id == proposal_id))
+
+
+async def adjust_many(
+    db: AsyncSession, proposal_ids: Sequence[UUID], delta: int, status: Optional[str] = None
+) -> None:
+    """Like adjust(), for many proposals in one statement.
+
+    `status` counts the proposals under that status instead of their
+    current one, for undoing the old status after an UPDATE ... RETURNING.
+    """
+    if not proposal_ids:
+        return
+    month = month_of(Proposal.created_at).label("month")
+    key = [Proposal.approval_group_id, Proposal.user_id, month, Proposal.type]
+    if status is None:
+        key.append(Proposal.status)
+    status_column = Proposal.status if status is None else literal(status, String)
+    # Rows are upserted, and so locked, in rollup key order; concurrent
+    # batches touching the same rows then queue instead of deadlocking
+    await _apply(db, select(
+        *key[:4],
+        status_column,
+        func.count(Proposal.id) * delta,
+    ).where(
+        Proposal.id.in_(proposal_ids)
+    ).group_by(*key).order_by(*key))
+
+
+async def rebuild(db: AsyncSession) -> None:
+    """Recompute the whole rollup from proposals"""
+    # Writers touching the rollup wait until the rebuild commits, then apply
+    # their delta on top of counts that do not yet include their change.
+    await db.execute(text("LOCK TABLE proposal_statistics IN EXCLUSIVE MODE"))
+    await db.execute(delete(ProposalStatistic))
+    month = month_of(Proposal.created_at).label("month")
+    await db.execute(insert(ProposalStatistic).from_select(ROLLUP_KEY + ["proposal_count"], select(
+        Proposal.approval_group_id,
+        Proposal.user_id,
+        month,
+        Proposal.type,
+        Proposal.status,
+        func.count(Proposal.id),
+    ).group_by(
+        Proposal.approval_group_id, Proposal.user_id, month, Proposal.type, Proposal.status
+    )))
+
+
+async def _main() -> None:
+    from app.auth.redis import close_redis
+    from app.cache import invalidate_statistics
+    from app.database import AsyncSessionLocal, engine
+    from app.models.group import Group
+
+    async with AsyncSessionLocal() as db:
+        await rebuild(db)
+        await db.commit()
+        group_ids = (await db.scalars(select(Group.id))).all()
+    await invalidate_statistics(*group_ids)
+    await close_redis()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
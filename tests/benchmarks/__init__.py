@@ -0,0 +1,6 @@
+"""Benchmarks backing the performance work.
+
+They assert the property each optimization promises and print their
+measurements; run them with ``pytest -s -m benchmark``. The ones marked
+``postgres`` also need TEST_DATABASE_URL.
+"""
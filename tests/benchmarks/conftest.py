@@ -0,0 +1,21 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.config import settings
+from tests.benchmarks.seed import seed_proposals
+
+# Scale of the seeded database; the acceptance figures are for a million proposals
+BENCHMARK_PROPOSALS = int(os.environ.get("BENCHMARK_PROPOSALS", 1_000_000))
+
+
+@pytest.fixture(scope="session")
+def seeded_database(migrated_database):
+    """The test database filled with BENCHMARK_PROPOSALS proposals; returns the count"""
+    engine = create_engine(settings.database_url)
+    try:
+        seed_proposals(engine, BENCHMARK_PROPOSALS)
+    finally:
+        engine.dispose()
+    return BENCHMARK_PROPOSALS
@@ -0,0 +1,47 @@
+"""Synthetic rows shaped like the proposal list queries' results."""
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from app.schemas.proposal import ProposalResponse
+
+ProposalRow = namedtuple("ProposalRow", list(ProposalResponse.model_fields))
+
+BASE_TIME = datetime(2025, 4, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def proposal_rows(count: int) -> List[ProposalRow]:
+    """Column rows as select(*schema_columns(Proposal, ProposalResponse)) returns them"""
+    groups = [uuid.uuid4() for _ in range(5)]
+    users = [uuid.uuid4() for _ in range(50)]
+    rows = []
+    for i in range(count):
+        created_at = BASE_TIME + timedelta(minutes=i)
+        approved = i % 3 == 0
+        rows.append(ProposalRow(
+            id=uuid.uuid4(),
+            user_id=users[i % len(users)],
+            article_id=f"ART{i % 2000:06d}",
+            article=f"申請手続きに関するFAQ その{i % 2000}",
+            type="修正" if i % 4 else "削除",
+            status="承認済み" if approved else "申請中",
+            title=f"申請書の記入方法を更新 #{i}",
+            info_category_id=None if i % 5 == 0 else groups[i % len(groups)],
+            keywords="申請,手続き,承認",
+            importance=i % 2 == 0,
+            published_start=date(2025, 4, 1),
+            published_end=None,
+            target="社内向け",
+            question="申請書はどこから提出できますか？",
+            answer="社内ポータルの「各種申請」メニューから提出してください。" * 3,
+            add_comments=None,
+            reason="手順が変わったため",
+            approval_group_id=groups[i % len(groups)],
+            approved_by=users[0] if approved else None,
+            approved_at=created_at + timedelta(hours=1) if approved else None,
+            rejection_reason=None,
+            created_at=created_at,
+            updated_at=created_at,
+        ))
+    return rows
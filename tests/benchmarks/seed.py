@@ -0,0 +1,80 @@
+"""Bulk seeding of the benchmark database.
+
+Everything is generated server side with generate_series so a million
+proposals load in one statement. Ids are md5-derived and therefore stable
+across runs. Text is built so that the search terms used by the
+benchmarks have known selectivity: 申請 (a two-character term) and
+経費精算 each occur in 1% of proposals and nowhere else.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+GROUPS = 10
+USERS = 500
+ARTICLES = 5000
+
+SEED_STATEMENTS = [
+    "TRUNCATE proposals_before, proposal_statistics, proposals, articles, info_categories, users, groups CASCADE",
+    f"""
+    INSERT INTO groups (id, name)
+    SELECT md5('group' || g)::uuid, 'ベンチマークグループ' || g FROM generate_series(1, {GROUPS}) g
+    """,
+    f"""
+    INSERT INTO users (id, username, email, hashed_password, role, group_id)
+    SELECT md5('user' || u)::uuid, 'bench' || u, 'bench' || u || '@example.com', '-',
+           CASE WHEN u <= {GROUPS} THEN 'SV' ELSE '一般ユーザー' END,
+           md5('group' || (u % {GROUPS} + 1))::uuid
+    FROM generate_series(1, {USERS}) u
+    """,
+    f"""
+    INSERT INTO articles (article_id, article, approval_group_id)
+    SELECT 'KB' || lpad(a::text, 6, '0'), '記事' || a, md5('group' || (a % {GROUPS} + 1))::uuid
+    FROM generate_series(1, {ARTICLES}) a
+    """,
+    f"""
+    INSERT INTO proposals (
+        user_id, article_id, article, type, status, title, keywords, question, answer, reason,
+        approval_group_id, approved_by, approved_at, rejection_reason, created_at, updated_at
+    )
+    SELECT
+        md5('user' || (i % {USERS} + 1))::uuid,
+        'KB' || lpad((i % {ARTICLES} + 1)::text, 6, '0'),
+        '記事' || (i % {ARTICLES} + 1),
+        CASE WHEN i % 4 = 0 THEN '削除' ELSE '修正' END,
+        CASE WHEN i % 10 = 0 THEN '却下' WHEN i % 10 <= 5 THEN '承認済み' ELSE '申請中' END,
+        CASE i % 100 WHEN 0 THEN '申請手順の変更 ' WHEN 1 THEN '経費精算の締め日 ' ELSE '' END
+            || (ARRAY['社内ポータルの使い方', 'パスワード再設定', '会議室の予約方法', '在宅勤務の手順', '備品の購入手続き'])[i % 5 + 1]
+            || ' ' || substr(md5(i::text), 1, 8),
+        (ARRAY['ポータル', 'パスワード', '会議室', '在宅勤務', '備品'])[i % 5 + 1],
+        (ARRAY['ポータル', 'パスワード', '会議室', '在宅勤務', '備品'])[i % 5 + 1] || 'について教えてください。',
+        repeat('担当部署の窓口にお問い合わせください。', 5),
+        '手順が変わったため',
+        md5('group' || ((i % {ARTICLES} + 1) % {GROUPS} + 1))::uuid,
+        CASE WHEN i % 10 BETWEEN 1 AND 5 THEN md5('user1')::uuid END,
+        CASE WHEN i % 10 BETWEEN 1 AND 5 THEN timestamptz '2024-01-01 09:00+09' + i * interval '30 seconds' + interval '1 day' END,
+        CASE WHEN i % 10 = 0 THEN '内容に不備があるため' END,
+        timestamptz '2024-01-01 09:00+09' + i * interval '30 seconds',
+        timestamptz '2024-01-01 09:00+09' + i * interval '30 seconds'
+    FROM generate_series(1, :count) i
+    """,
+    # Same grouping as app.services.statistics_rollup.rebuild()
+    """
+    INSERT INTO proposal_statistics (approval_group_id, user_id, month, type, status, proposal_count)
+    SELECT approval_group_id, user_id, date_trunc('month', timezone(:tz, created_at))::date,
+           type, status, count(*)
+    FROM proposals GROUP BY 1, 2, 3, 4, 5
+    """,
+]
+
+
+def seed_proposals(engine: Engine, count: int) -> None:
+    """Replace the database contents with ``count`` synthetic proposals, unless already seeded"""
+    with engine.begin() as conn:
+        if conn.scalar(text("SELECT count(*) FROM proposals")) == count:
+            return
+        for statement in SEED_STATEMENTS:
+            conn.execute(text(statement), {"count": count, "tz": settings.business_timezone})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
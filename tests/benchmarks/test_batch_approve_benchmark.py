@@ -0,0 +1,76 @@
+"""batch-approve versus one approve request per proposal.
+
+Both variants approve BATCH_SIZE pending proposals of the seeded
+database through the full application; the batch does it in a fixed
+number of statements however many ids it carries.
+"""
+import hashlib
+import time
+import uuid
+
+import pytest
+from sqlalchemy import event, select
+
+from app.auth import Principal
+from app.database import engine
+from app.models.proposal import Proposal
+from tests.conftest import login
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.postgres]
+
+BATCH_SIZE = 100
+
+# A seeded user (see tests.benchmarks.seed), acting as administrator
+APPROVER = Principal(id=uuid.UUID(hashlib.md5(b"user1").hexdigest()), role="管理者", group_id=None)
+
+
+async def pending_ids(db_engine, count):
+    async with db_engine.connect() as conn:
+        return (await conn.scalars(select(Proposal.id).where(
+            Proposal.status == "申請中", Proposal.user_id != APPROVER.id
+        ).limit(count))).all()
+
+
+async def approve_one_by_one(client, ids):
+    for proposal_id in ids:
+        response = await client.post(f"/api/v1/proposals/{proposal_id}/approve", json={"status": "承認済み"})
+        assert response.status_code == 200
+
+
+async def approve_in_one_batch(client, ids):
+    response = await client.post("/api/v1/proposals/batch-approve", json={
+        "status": "承認済み", "ids": [str(i) for i in ids],
+    })
+    assert response.json()["succeeded"] == len(ids)
+
+
+async def measure(client, variant, ids):
+    """(seconds, statements) for approving ``ids``"""
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        started = time.perf_counter()
+        await variant(client, ids)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+    return elapsed, len(statements)
+
+
+async def test_batch_beats_single_approves(client, db_engine, seeded_database):
+    login(APPROVER)
+    ids = await pending_ids(db_engine, BATCH_SIZE * 2)
+    assert len(ids) == BATCH_SIZE * 2
+
+    slow, slow_statements = await measure(client, approve_one_by_one, ids[:BATCH_SIZE])
+    fast, fast_statements = await measure(client, approve_in_one_batch, ids[BATCH_SIZE:])
+    print(
+        f"\n{BATCH_SIZE} approvals over {seeded_database} proposals: one by one {slow * 1000:.0f} ms"
+        f" ({slow_statements} statements), batch {fast * 1000:.0f} ms ({fast_statements} statements)"
+    )
+
+    assert fast_statements < slow_statements / 10
+    assert fast < slow
@@ -0,0 +1,81 @@
+"""Bytes on the wire and compression CPU per route template.
+
+Drives CompressionMiddleware with representative list payloads and reads
+the per-route totals back from compression_stats, as /metrics/compression
+reports them. Run with ``pytest -s`` to see the table.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.compression import CompressionMiddleware, CompressionStats
+from app.responses import FastJSONResponse, page_response, row_items
+from app.schemas.proposal import ProposalResponse
+from tests.benchmarks.data import proposal_rows
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS_PER_ROUTE = 20
+FIELDS = list(ProposalResponse.model_fields)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    page = row_items(proposal_rows(100), FIELDS)
+    export = row_items(proposal_rows(2000), FIELDS)
+    summary = row_items(proposal_rows(100), ["id", "title", "status", "created_at"])
+
+    @app.get("/api/v1/proposals/")
+    def proposals():
+        return page_response(page, "cursor")
+
+    @app.get("/api/v1/proposals/export")
+    def proposals_export():
+        return FastJSONResponse(export)
+
+    @app.get("/api/v1/proposals/summary")
+    def proposals_summary():
+        return FastJSONResponse(summary)
+
+    @app.get("/api/v1/statistics/dashboard")
+    def dashboard():
+        return {"total": 1000, "pending": 12, "approved": 900, "rejected": 88}
+
+    return app
+
+
+@pytest.mark.parametrize("level", [1, 6, 9])
+def test_compression_bytes_and_cpu_per_route(level, monkeypatch):
+    stats = CompressionStats()
+    monkeypatch.setattr("app.middleware.compression.compression_stats", stats)
+    monkeypatch.setattr(settings, "compression_gzip_level", level)
+    client = TestClient(_app())
+
+    for path in ["/api/v1/proposals/", "/api/v1/proposals/export", "/api/v1/proposals/summary",
+                 "/api/v1/statistics/dashboard"]:
+        for _ in range(REQUESTS_PER_ROUTE):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert response.status_code == 200
+
+    routes = {entry["route"]: entry for entry in stats.stats()["routes"]}
+    print(f"\ngzip level {level}")
+    print(f"{'route':32} {'raw KiB':>9} {'wire KiB':>9} {'ratio':>7} {'ms/resp':>8}")
+    for route, entry in routes.items():
+        print(
+            f"{route:32} {entry['bytes_in'] / entry['responses'] / 1024:9.1f}"
+            f" {entry['bytes_out'] / entry['responses'] / 1024:9.1f} {entry['ratio']:7.3f}"
+            f" {entry['seconds'] / entry['responses'] * 1000:8.2f}"
+        )
+
+    # Tiny bodies are not worth the CPU and are skipped
+    assert "/api/v1/statistics/dashboard" not in routes
+    assert stats.skipped == REQUESTS_PER_ROUTE
+    # JSON lists shrink by well over half at any level
+    for entry in routes.values():
+        assert entry["responses"] == REQUESTS_PER_ROUTE
+        assert entry["ratio"] < 0.3
+    # A 100-row page costs a few milliseconds at most
+    page = routes["/api/v1/proposals/"]
+    assert page["seconds"] / page["responses"] < 0.05
@@ -0,0 +1,79 @@
+"""A slow query must not stall the other requests in the worker.
+
+Requests go through the full application over httpx's ASGI transport,
+in the test's event loop, so any query that blocked the loop would
+delay every request issued while it ran.
+"""
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.auth import Principal, get_current_user
+from app.cache import response_cache
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.postgres]
+
+SLOW_QUERY_SECONDS = 3.0
+CONCURRENCY = 5
+BASELINE_REQUESTS = 100
+
+
+@pytest.fixture
+async def client(migrated_database, fake_redis, monkeypatch):
+    monkeypatch.setattr(response_cache, "_client", fake_redis)
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=uuid.uuid4(), role="管理者", group_id=None)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+async def timed_get(client, path):
+    started = time.perf_counter()
+    response = await client.get(path)
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+
+async def run_requests(client, keep_going):
+    latencies = []
+
+    async def worker():
+        while keep_going(len(latencies)):
+            latencies.append(await timed_get(client, "/api/v1/groups/"))
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return latencies
+
+
+def p99(latencies):
+    return statistics.quantiles(latencies, n=100)[98]
+
+
+async def slow_query():
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": SLOW_QUERY_SECONDS})
+
+
+async def test_slow_query_does_not_raise_p99(client):
+    baseline = await run_requests(client, lambda done: done < BASELINE_REQUESTS)
+
+    slow = asyncio.create_task(slow_query())
+    await asyncio.sleep(0.1)
+    loaded = await run_requests(client, lambda done: not slow.done())
+    await slow
+
+    print(
+        f"\nGET /api/v1/groups/ p99: {p99(baseline) * 1000:.1f} ms alone, {p99(loaded) * 1000:.1f} ms"
+        f" during a {SLOW_QUERY_SECONDS:.0f} s query ({len(loaded)} requests)"
+    )
+    assert len(loaded) >= BASELINE_REQUESTS
+    assert p99(loaded) < p99(baseline) * 3 + 0.05
@@ -0,0 +1,54 @@
+"""/proposals/search stays within the 5 second budget at 1M proposals.
+
+Runs the endpoint's query for a two-character term, which goes through
+the unigram/bigram index, and a longer term, which goes through pg_trgm,
+and checks that the planner picks those indexes on the seeded data.
+"""
+import time
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.api.v1.proposals import search_query
+from app.auth import Principal
+from app.models.proposal import Proposal
+from app.pagination import apply_keyset
+from app.services.proposal_search import match_condition, search_terms
+from tests.conftest import explain
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.postgres]
+
+SEARCH_BUDGET_SECONDS = 5.0
+
+
+def first_page(q, current_user):
+    query, sort_key = search_query(q, current_user)
+    return apply_keyset(query, sort_key, None, 20, descending=True)
+
+
+@pytest.mark.parametrize("q, index", [
+    ("申請", "idx_proposals_search_short_ngrams"),
+    ("経費精算", "idx_proposals_search_trgm"),
+    ("申請 手順", "idx_proposals_search_short_ngrams"),
+])
+@pytest.mark.parametrize("role", ["管理者", "SV"])
+async def test_search_within_budget(db_engine, seeded_database, q, index, role):
+    async with db_engine.connect() as conn:
+        # An SV of a group that has matches
+        group_id = await conn.scalar(
+            select(Proposal.approval_group_id).where(match_condition(search_terms(q))).limit(1)
+        )
+        current_user = Principal(id=uuid.uuid4(), role=role, group_id=group_id)
+        query = first_page(q, current_user)
+
+        plan = await explain(conn, query)
+        started = time.perf_counter()
+        rows = (await conn.execute(query)).all()
+        elapsed = time.perf_counter() - started
+
+    print(f"\n{role} search {q!r} over {seeded_database} proposals: {elapsed * 1000:.1f} ms, {len(rows)} rows")
+    assert index in plan, plan
+    assert rows
+    assert all(term in row.title for row in rows for term in search_terms(q))
+    assert elapsed < SEARCH_BUDGET_SECONDS
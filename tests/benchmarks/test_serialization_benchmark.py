@@ -0,0 +1,58 @@
+"""Fast list serialization versus the response_model path.
+
+The old list endpoints returned ORM objects through
+``response_model=Page[ProposalExpandedResponse]``: Pydantic validation,
+jsonable_encoder, then json.dumps. The fast path builds dicts from column
+rows and renders them with orjson. Both must produce byte-identical JSON;
+that check runs with the unit tests, the timing only as a benchmark.
+"""
+import time
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.v1.proposals import PROPOSAL_UNEXPANDED
+from app.responses import page_response, row_items
+from app.schemas.pagination import Page
+from app.schemas.proposal import ProposalExpandedResponse, ProposalResponse
+from tests.benchmarks.data import proposal_rows
+
+ROWS = 10_000
+ROUNDS = 3
+
+
+def response_model_body(rows) -> bytes:
+    page = Page[ProposalExpandedResponse].model_validate(
+        {"items": rows, "next_cursor": "cursor"}, from_attributes=True
+    )
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+def fast_body(rows) -> bytes:
+    items = row_items(rows, list(ProposalResponse.model_fields), PROPOSAL_UNEXPANDED)
+    return page_response(items, "cursor").body
+
+
+def best_of(render, rows) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        render(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def test_fast_path_matches_response_model_output():
+    rows = proposal_rows(200)
+    assert fast_body(rows) == response_model_body(rows)
+
+
+@pytest.mark.benchmark
+def test_fast_path_is_faster():
+    rows = proposal_rows(ROWS)
+    slow = best_of(response_model_body, rows)
+    fast = best_of(fast_body, rows)
+    print(f"\n{ROWS} proposals: response_model {slow * 1000:.1f} ms, fast path {fast * 1000:.1f} ms"
+          f" ({slow / fast:.1f}x)")
+    assert fast * 2 < slow
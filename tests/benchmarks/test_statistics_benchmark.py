@@ -0,0 +1,107 @@
+"""approval-statistics: one FILTER aggregate versus four COUNTs.
+
+The endpoint used to issue a COUNT over proposals per status. The first
+benchmark compares that with counting every status in one pass over
+proposals with count(*) FILTER (WHERE ...). The endpoint now sums the
+proposal_statistics rollup instead, which is measured separately.
+Statements are counted with an engine event.
+"""
+import time
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.api.v1.statistics import _rollup_count
+from app.models.proposal import Proposal
+from app.models.proposal_statistic import ProposalStatistic
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.postgres]
+
+ROUNDS = 5
+STATUSES = ["申請中", "承認済み", "却下"]
+
+
+async def four_counts(conn, group_id):
+    scope = [Proposal.approval_group_id == group_id] if group_id else []
+    total = await conn.scalar(select(func.count(Proposal.id)).where(*scope))
+    by_status = [
+        await conn.scalar(select(func.count(Proposal.id)).where(*scope, Proposal.status == s))
+        for s in STATUSES
+    ]
+    return [total, *by_status]
+
+
+async def single_aggregate(conn, group_id):
+    query = select(
+        func.count(Proposal.id),
+        *(func.count(Proposal.id).filter(Proposal.status == s) for s in STATUSES),
+    )
+    if group_id:
+        query = query.where(Proposal.approval_group_id == group_id)
+    return list((await conn.execute(query)).one())
+
+
+async def rollup_aggregate(conn, group_id):
+    query = select(_rollup_count(), *(_rollup_count(ProposalStatistic.status == s) for s in STATUSES))
+    if group_id:
+        query = query.where(ProposalStatistic.approval_group_id == group_id)
+    return list((await conn.execute(query)).one())
+
+
+async def measure(engine, variant, group_id):
+    """(best latency, statements per call, result) over ROUNDS calls after a warm-up"""
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+    async with engine.connect() as conn:
+        result = await variant(conn, group_id)
+        timings = []
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            for _ in range(ROUNDS):
+                started = time.perf_counter()
+                await variant(conn, group_id)
+                timings.append(time.perf_counter() - started)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+    return min(timings), len(statements) // ROUNDS, result
+
+
+async def scope_group(engine, scope):
+    if scope == "admin":
+        return None
+    async with engine.connect() as conn:
+        return await conn.scalar(select(Proposal.approval_group_id).limit(1))
+
+
+@pytest.mark.parametrize("scope", ["admin", "sv"])
+async def test_single_aggregate_beats_four_counts(db_engine, seeded_database, scope):
+    group_id = await scope_group(db_engine, scope)
+
+    slow, slow_statements, expected = await measure(db_engine, four_counts, group_id)
+    fast, fast_statements, counts = await measure(db_engine, single_aggregate, group_id)
+    print(
+        f"\n{scope} over {seeded_database} proposals: four COUNTs {slow * 1000:.1f} ms"
+        f" ({slow_statements} queries), one FILTER aggregate {fast * 1000:.1f} ms ({fast_statements} query)"
+    )
+
+    assert counts == expected
+    assert (slow_statements, fast_statements) == (4, 1)
+    assert fast < slow
+
+
+@pytest.mark.parametrize("scope", ["admin", "sv"])
+async def test_rollup_aggregate(db_engine, seeded_database, scope):
+    group_id = await scope_group(db_engine, scope)
+
+    slow, _, expected = await measure(db_engine, single_aggregate, group_id)
+    fast, fast_statements, counts = await measure(db_engine, rollup_aggregate, group_id)
+    print(
+        f"\n{scope} over {seeded_database} proposals: FILTER aggregate over proposals {slow * 1000:.1f} ms,"
+        f" rollup {fast * 1000:.1f} ms"
+    )
+
+    assert counts == expected
+    assert fast_statements == 1
+    assert fast < slow
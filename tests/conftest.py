@@ -0,0 +1,182 @@
+"""Shared fixtures.
+
+Unit tests run anywhere; Redis is replaced by fakeredis. Tests marked
+``postgres`` need a disposable PostgreSQL database in TEST_DATABASE_URL
+(a synchronous ``postgresql://`` URL, as DATABASE_URL), which becomes the
+application's DATABASE_URL and is migrated to head.
+"""
+import os
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # Must happen before app.config is imported
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+import fakeredis
+import httpx
+import pytest
+from alembic import command
+from alembic.config import Config
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.auth import Principal, get_current_user
+from app.auth import redis as redis_module
+from app.cache import response_cache
+from app.config import settings
+from app.database import ASYNC_DATABASE_URL, engine
+from app.main import app
+from app.models.article import Article
+from app.models.group import Group
+from app.models.proposal import Proposal
+from app.models.user import User
+from app.services import statistics_rollup
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def migrated_database():
+    """Upgrade the TEST_DATABASE_URL database to the latest migration"""
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+async def db_engine(migrated_database):
+    """Async engine on the test database; unpooled so it never outlives the test's event loop"""
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def sample_data(db_engine):
+    """Empty the test database and add two groups with their users and articles.
+
+    The users are returned as principals: ``admin``, ``sv`` and ``user``
+    belong to ``group_id`` (articles KB000001), ``other_user`` to
+    ``other_group_id`` (KB000002).
+    """
+    group_id, other_group_id = uuid.uuid4(), uuid.uuid4()
+    principals = {
+        "admin": Principal(id=uuid.uuid4(), role="管理者", group_id=None),
+        "sv": Principal(id=uuid.uuid4(), role="SV", group_id=group_id),
+        "user": Principal(id=uuid.uuid4(), role="一般ユーザー", group_id=group_id),
+        "other_user": Principal(id=uuid.uuid4(), role="一般ユーザー", group_id=other_group_id),
+    }
+    async with db_engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "TRUNCATE proposals_before, proposal_statistics, proposals, articles, info_categories, users, groups CASCADE"
+        )
+        await conn.execute(insert(Group), [
+            {"id": group_id, "name": "グループA"},
+            {"id": other_group_id, "name": "グループB"},
+        ])
+        await conn.execute(insert(User), [
+            {
+                "id": p.id, "username": name, "email": f"{name}@example.com", "hashed_password": "-",
+                "role": p.role, "group_id": p.group_id,
+            }
+            for name, p in principals.items()
+        ])
+        await conn.execute(insert(Article), [
+            {"article_id": "KB000001", "article": "記事1", "approval_group_id": group_id},
+            {"article_id": "KB000002", "article": "記事2", "approval_group_id": other_group_id},
+        ])
+    return SimpleNamespace(group_id=group_id, other_group_id=other_group_id, **principals)
+
+
+async def add_proposals(db_engine, count: int, user: Principal, article_id: str = "KB000001", **values) -> List[uuid.UUID]:
+    """Insert proposals directly, counted in the rollup as the API would count them"""
+    group_id = values.pop("approval_group_id", None) or user.group_id
+    async with AsyncSession(db_engine) as db:
+        ids = (await db.scalars(insert(Proposal).returning(Proposal.id), [
+            {
+                "user_id": user.id, "article_id": article_id, "article": article_id, "type": "修正",
+                "title": f"提案{i}", "reason": "手順が変わったため", "approval_group_id": group_id, **values,
+            }
+            for i in range(count)
+        ])).all()
+        await statistics_rollup.adjust_many(db, ids, 1)
+        await db.commit()
+    return list(ids)
+
+
+@pytest.fixture
+async def client(fake_redis, monkeypatch):
+    """httpx client for the whole application; pick the caller with login().
+
+    Requests that reach the database need a postgres-marked test and the
+    sample_data fixture.
+    """
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    monkeypatch.setattr(response_cache, "_client", fake_redis)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+def login(principal: Principal) -> None:
+    """Authenticate every following request of the client as ``principal``"""
+    app.dependency_overrides[get_current_user] = lambda: principal
+
+
+async def explain(conn, query) -> str:
+    """EXPLAIN output for a Core query, with its parameters inlined"""
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    result = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+    return "\n".join(line for line, in result)
+
+
+@pytest.fixture
+async def fake_redis():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+def write_key_pair(directory, name: str):
+    """Write a fresh RSA key pair as PEM files; returns (private path, public path)"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = directory / f"{name}_private.pem"
+    public_path = directory / f"{name}_public.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+    return str(private_path), str(public_path)
+
+
+@pytest.fixture
+def jwt_keys(tmp_path, monkeypatch):
+    """Point the settings at a temporary key pair"""
+    private_path, public_path = write_key_pair(tmp_path, "current")
+    monkeypatch.setattr(settings, "jwt_private_key_path", private_path)
+    monkeypatch.setattr(settings, "jwt_public_key_path", public_path)
+    monkeypatch.setattr(settings, "jwt_additional_public_key_paths", [])
+    return private_path, public_path
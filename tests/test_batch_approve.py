@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.database import engine
+from app.models.proposal import Proposal
+from app.models.proposal_statistic import ProposalStatistic
+from tests.conftest import add_proposals, login
+
+pytestmark = pytest.mark.postgres
+
+
+async def rollup_counts(db_engine):
+    async with db_engine.connect() as conn:
+        rows = await conn.execute(select(
+            ProposalStatistic.status, func.sum(ProposalStatistic.proposal_count)
+        ).group_by(ProposalStatistic.status))
+    return {status: count for status, count in rows}
+
+
+async def test_results_are_reported_per_id(client, db_engine, sample_data):
+    approvable = await add_proposals(db_engine, 2, sample_data.user)
+    own = await add_proposals(db_engine, 1, sample_data.sv)
+    other_group = await add_proposals(db_engine, 1, sample_data.other_user, "KB000002")
+    missing = uuid.uuid4()
+    login(sample_data.sv)
+
+    response = await client.post("/api/v1/proposals/batch-approve", json={
+        "status": "承認済み", "ids": [str(i) for i in [*approvable, *own, *other_group, missing, approvable[0]]],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert [(r["id"], r["success"], r["detail"]) for r in body["results"]] == [
+        (str(approvable[0]), True, None),
+        (str(approvable[1]), True, None),
+        (str(own[0]), False, "You cannot approve your own proposal"),
+        (str(other_group[0]), False, "You can only approve proposals for your group"),
+        (str(missing), False, "Proposal not found"),
+    ]
+    async with db_engine.connect() as conn:
+        decided = (await conn.execute(
+            select(Proposal.status, Proposal.approved_by).where(Proposal.id.in_(approvable))
+        )).all()
+    assert decided == [("承認済み", sample_data.sv.id)] * 2
+    assert await rollup_counts(db_engine) == {"申請中": 2, "承認済み": 2}
+
+
+async def test_already_decided_and_missing_ids_fail_without_changes(client, db_engine, sample_data):
+    approved = await add_proposals(db_engine, 1, sample_data.user, status="承認済み")
+    rejected = await add_proposals(db_engine, 1, sample_data.user, status="却下", rejection_reason="不備")
+    missing = uuid.uuid4()
+    login(sample_data.admin)
+
+    response = await client.post("/api/v1/proposals/batch-approve", json={
+        "status": "却下", "rejection_reason": "重複", "ids": [str(i) for i in [*approved, missing, *rejected]],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (0, 3)
+    assert [r["detail"] for r in body["results"]] == [
+        "Proposal is not pending approval", "Proposal not found", "Proposal is not pending approval",
+    ]
+    assert await rollup_counts(db_engine) == {"承認済み": 1, "却下": 1}
+
+
+async def test_statement_count_does_not_grow_with_batch_size(client, db_engine, sample_data):
+    login(sample_data.admin)
+
+    async def statements_for(count):
+        ids = await add_proposals(db_engine, count, sample_data.user)
+        statements = []
+
+        def count_statement(*args):
+            statements.append(args[2])
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            response = await client.post("/api/v1/proposals/batch-approve", json={
+                "status": "承認済み", "ids": [str(i) for i in [*ids, uuid.uuid4()]],
+            })
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+        assert response.json()["succeeded"] == count
+        return len(statements)
+
+    assert await statements_for(5) == await statements_for(100)
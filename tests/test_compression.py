@@ -0,0 +1,97 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, choose_encoding, compression_stats
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+LARGE_BODY = b'{"items":[' + b",".join([b'{"title":"\xe7\x94\xb3\xe8\xab\x8b"}'] * 500) + b"]}"
+
+
+@pytest.mark.parametrize("accept_encoding, available, expected", [
+    ("gzip, br", ["gzip", "br"], "br"),
+    ("gzip;q=1.0, br;q=0.5", ["gzip", "br"], "gzip"),
+    ("br", ["gzip"], None),
+    ("gzip;q=0", ["gzip"], None),
+    ("*", ["gzip"], "gzip"),
+    ("*;q=0.5, gzip;q=0", ["gzip", "br"], "br"),
+    ("GZIP", ["gzip"], "gzip"),
+    ("gzip;q=abc", ["gzip"], None),
+    ("", ["gzip"], None),
+])
+def test_choose_encoding(accept_encoding, available, expected):
+    assert choose_encoding(accept_encoding, available) == expected
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return Response(LARGE_BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([LARGE_BODY, LARGE_BODY]), media_type="application/x-ndjson")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(LARGE_BODY), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+def test_large_response_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LARGE_BODY) / 10
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.content == LARGE_BODY
+
+
+def test_response_is_not_compressed_without_accept_encoding(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+@pytest.mark.parametrize("path", ["/small", "/stream"])
+def test_small_and_streaming_responses_pass_through(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_already_encoded_response_is_left_alone(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == LARGE_BODY
+
+
+def test_stats_use_route_templates():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=0)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return Response(LARGE_BODY, media_type="application/json")
+
+    client = TestClient(app)
+    client.get("/items/1", headers={"Accept-Encoding": "gzip"})
+    client.get("/items/2", headers={"Accept-Encoding": "gzip"})
+    client.get("/no/such/path", headers={"Accept-Encoding": "gzip"})
+
+    routes = {entry["route"] for entry in compression_stats.stats()["routes"]}
+    assert "/items/{item_id}" in routes
+    assert UNMATCHED_ROUTE in routes
+    assert not any(route.startswith("/items/1") or route.startswith("/no/") for route in routes)
@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+from app.auth import Principal
+from app.cache import invalidate_table
+from tests.conftest import login
+
+
+async def current_etag(client, path, **params):
+    """The ETag of a resource, read from a 304 to If-None-Match: * without touching the database"""
+    response = await client.get(path, params=params, headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+    return response.headers["etag"]
+
+
+@pytest.fixture
+def admin():
+    login(Principal(id=uuid.uuid4(), role="管理者", group_id=None))
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "W/{etag}",
+    '"stale", {etag}',
+    '"stale",W/{etag}',
+    "*",
+])
+async def test_matching_if_none_match_returns_304(client, admin, if_none_match):
+    etag = await current_etag(client, "/api/v1/groups/")
+
+    response = await client.get("/api/v1/groups/", headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+async def test_etag_covers_path_and_query(client, admin):
+    etags = {
+        await current_etag(client, "/api/v1/groups/"),
+        await current_etag(client, "/api/v1/groups/", limit=5),
+        await current_etag(client, "/api/v1/groups/", fields="id,name"),
+        await current_etag(client, "/api/v1/articles/"),
+    }
+
+    assert len(etags) == 4
+    assert await current_etag(client, "/api/v1/groups/", limit=5) in etags
+
+
+async def test_etag_changes_after_invalidate_table(client, admin):
+    groups = await current_etag(client, "/api/v1/groups/")
+    articles = await current_etag(client, "/api/v1/articles/")
+
+    await invalidate_table("groups")
+
+    assert await current_etag(client, "/api/v1/groups/") != groups
+    assert await current_etag(client, "/api/v1/articles/") == articles
+
+
+@pytest.mark.postgres
+async def test_not_modified_until_an_admin_write(client, sample_data):
+    login(sample_data.admin)
+    first = await client.get("/api/v1/groups/")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert (await client.get("/api/v1/groups/", headers={"If-None-Match": etag})).status_code == 304
+    assert (await client.get("/api/v1/groups/", headers={"If-None-Match": '"stale"'})).status_code == 200
+
+    created = await client.post("/api/v1/groups/", json={"name": "グループC"})
+    assert created.status_code == 200
+
+    after = await client.get("/api/v1/groups/", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert "グループC" in {group["name"] for group in after.json()["items"]}
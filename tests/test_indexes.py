@@ -0,0 +1,67 @@
+"""The list, statistics and search queries are planned on their indexes.
+
+Each case EXPLAINs the query builder the endpoint itself uses. Sequential
+scans are disabled so the plans do not depend on how much data the test
+database holds; the assertion is that each query can use the index meant
+for it, not that it beats a scan of a tiny table.
+"""
+import uuid
+from datetime import date
+
+import pytest
+
+from app.api.v1.proposals import (
+    PROPOSAL_SORT_KEY, article_query, pending_approval_query, proposal_list_query, search_query
+)
+from app.api.v1.statistics import (
+    _approval_statistics_query, _monthly_proposals_query, _monthly_trends_query, _personal_statistics_query
+)
+from app.auth import Principal
+from app.pagination import apply_keyset
+from tests.conftest import explain
+
+pytestmark = pytest.mark.postgres
+
+ADMIN = Principal(id=uuid.uuid4(), role="管理者", group_id=None)
+SV = Principal(id=uuid.uuid4(), role="SV", group_id=uuid.uuid4())
+USER = Principal(id=uuid.uuid4(), role="一般ユーザー", group_id=None)
+
+
+def first_page(query, sort_key=PROPOSAL_SORT_KEY, descending=False):
+    return apply_keyset(query, sort_key, None, 20, descending=descending)
+
+
+def search(q):
+    query, sort_key = search_query(q, ADMIN)
+    return first_page(query, sort_key, descending=True)
+
+
+@pytest.mark.parametrize("query, index", [
+    (first_page(proposal_list_query(ADMIN), descending=True), "idx_proposals_created_at_id"),
+    (first_page(proposal_list_query(ADMIN, "申請中"), descending=True), "idx_proposals_status_created_at"),
+    (first_page(pending_approval_query(ADMIN)), "idx_proposals_status_created_at"),
+    (first_page(pending_approval_query(SV)), "idx_proposals_approval_group_status"),
+    (_monthly_proposals_query(USER.id, 2025, 4), "idx_proposal_statistics_user_month"),
+    (
+        _personal_statistics_query(USER.id, "month", date(2025, 4, 1), date(2025, 6, 30)),
+        "idx_proposal_statistics_user_month",
+    ),
+    (
+        _personal_statistics_query(USER.id, "month", date(2025, 4, 10), date(2025, 5, 24)),
+        "idx_proposals_user_created_at",
+    ),
+    (_monthly_trends_query(2025, SV), "proposal_statistics_pkey"),
+    (_approval_statistics_query(SV), "proposal_statistics_pkey"),
+    (article_query("KB000001", with_revision=True), "idx_proposals_article_id"),
+    (search("経費精算"), "idx_proposals_search_trgm"),
+    (search("申請"), "idx_proposals_search_short_ngrams"),
+], ids=[
+    "list", "list-by-status", "pending-admin", "pending-sv", "user-monthly", "personal-whole-months",
+    "personal-mid-month", "monthly-trends-sv", "approval-statistics-sv", "article-latest-revision",
+    "search-long-term", "search-short-term",
+])
+async def test_query_uses_index(db_engine, query, index):
+    async with db_engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        plan = await explain(conn, query)
+    assert index in plan, plan
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.auth import keys as keys_module
+from app.auth import redis as redis_module
+from app.auth.keys import KEY_RELOAD_CHANNEL, KeyLoadError, KeyStore
+from app.config import settings
+from tests.conftest import write_key_pair
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(keys_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_keys_are_parsed_once_and_tokens_without_kid_use_the_current_key(jwt_keys):
+    store = KeyStore()
+    kid, signing_key = store.signing_key()
+
+    assert store.loaded
+    assert store.verification_kids() == [kid]
+    assert store.verification_key(None) is store.verification_key(kid)
+    assert store.signing_key()[1] is signing_key
+
+
+def test_rotated_out_key_stays_valid_for_the_grace_period(jwt_keys, tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(settings, "jwt_key_rotation_grace_minutes", 10)
+    store = KeyStore()
+    old_kid, _ = store.signing_key()
+
+    private_path, public_path = write_key_pair(tmp_path, "next")
+    monkeypatch.setattr(settings, "jwt_private_key_path", private_path)
+    monkeypatch.setattr(settings, "jwt_public_key_path", public_path)
+    store.reload()
+    new_kid, _ = store.signing_key()
+
+    assert new_kid != old_kid
+    assert store.verification_key(old_kid) is not None
+    assert set(store.verification_kids()) == {old_kid, new_kid}
+
+    clock[0] += 10 * 60 + 1
+    assert store.verification_key(old_kid) is None
+    assert store.verification_kids() == [new_kid]
+
+
+def test_additional_public_keys_are_accepted(jwt_keys, tmp_path, monkeypatch):
+    _, extra_public_path = write_key_pair(tmp_path, "extra")
+    monkeypatch.setattr(settings, "jwt_additional_public_key_paths", [extra_public_path, str(tmp_path / "missing.pem")])
+    store = KeyStore()
+    kid, _ = store.signing_key()
+
+    kids = store.verification_kids()
+    assert len(kids) == 2 and kid in kids
+
+
+def test_unknown_kid_is_not_accepted(jwt_keys):
+    assert KeyStore().verification_key("unknown") is None
+
+
+def test_missing_key_file(jwt_keys, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "jwt_private_key_path", str(tmp_path / "missing.pem"))
+    store = KeyStore()
+
+    with pytest.raises(KeyLoadError):
+        store.load()
+
+    # reload() is used as a signal handler and must not raise
+    store.reload()
+    assert not store.loaded
+
+
+async def test_reload_is_broadcast_to_other_workers(jwt_keys, fake_redis, tmp_path, monkeypatch):
+    local, other = KeyStore(), KeyStore()
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    monkeypatch.setattr(redis_module, "key_store", local)
+    old_kid, _ = local.signing_key()
+    assert other.signing_key()[0] == old_kid
+    await local.start(fake_redis)
+    await other.start(fake_redis)
+    try:
+        for _ in range(300):
+            if (await fake_redis.pubsub_numsub(KEY_RELOAD_CHANNEL))[0][1] == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        private_path, public_path = write_key_pair(tmp_path, "next")
+        monkeypatch.setattr(settings, "jwt_private_key_path", private_path)
+        monkeypatch.setattr(settings, "jwt_public_key_path", public_path)
+        await redis_module.publish_key_reload()
+
+        for _ in range(300):
+            if other.signing_key()[0] != old_kid:
+                break
+            await asyncio.sleep(0.01)
+        assert other.signing_key()[0] != old_kid
+        # The publishing worker reloads by itself and ignores its own message
+        assert local.signing_key()[0] == old_kid
+    finally:
+        await other.stop()
+        await local.stop()
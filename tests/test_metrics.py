@@ -0,0 +1,90 @@
+import pytest
+
+from app.config import settings
+from app.middleware.metrics import UNMATCHED_ROUTE, RequestMetrics, stats_lines
+
+
+def samples(text, name):
+    """{labels: value} for the samples of one metric in Prometheus text output"""
+    found = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            labels, _, value = line[len(name):].rpartition(" ")
+            found[labels] = float(value)
+    return found
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        metrics.observe("GET", "/api/v1/groups/", 200, seconds)
+
+    text = "\n".join(metrics.render())
+
+    labels = 'method="GET",route="/api/v1/groups/"'
+    assert samples(text, "http_request_duration_seconds_bucket") == {
+        "{" + labels + ',le="0.1"}': 2,
+        "{" + labels + ',le="1.0"}': 3,
+        "{" + labels + ',le="+Inf"}': 4,
+    }
+    assert samples(text, "http_request_duration_seconds_count") == {"{" + labels + "}": 4}
+    assert samples(text, "http_request_duration_seconds_sum") == {"{" + labels + "}": pytest.approx(2.65)}
+    assert "# TYPE http_request_duration_seconds histogram" in text
+
+
+def test_budget_breaches_are_counted_except_for_unmatched_routes(monkeypatch):
+    monkeypatch.setattr(settings, "latency_budget_seconds", 1.0)
+    monkeypatch.setattr(settings, "latency_budgets", {"GET /api/v1/proposals/search": 5.0})
+    metrics = RequestMetrics()
+
+    metrics.observe("GET", "/api/v1/groups/", 200, 1.5)
+    metrics.observe("GET", "/api/v1/proposals/search", 200, 1.5)
+    metrics.observe("GET", UNMATCHED_ROUTE, 404, 1.5)
+
+    assert dict(metrics.budget_exceeded) == {("GET", "/api/v1/groups/"): 1}
+
+
+def test_stats_lines_type_counters_and_gauges():
+    lines = stats_lines("db_pool", "Database connection pool", {
+        "checked_out": 2, "checkouts": 10, "wait_seconds_avg": 0.25, "synced": True, "name": "x",
+    })
+
+    assert lines == [
+        "# HELP db_pool_checked_out Database connection pool (checked_out)",
+        "# TYPE db_pool_checked_out gauge",
+        "db_pool_checked_out 2",
+        "# HELP db_pool_checkouts Database connection pool (checkouts)",
+        "# TYPE db_pool_checkouts counter",
+        "db_pool_checkouts 10",
+        "# HELP db_pool_wait_seconds_avg Database connection pool (wait_seconds_avg)",
+        "# TYPE db_pool_wait_seconds_avg gauge",
+        "db_pool_wait_seconds_avg 0.25",
+    ]
+
+
+async def test_metrics_endpoint_labels_routes_by_template(client):
+    await client.get("/health")
+    await client.get("/no/such/path")
+    await client.get("/metrics/no-such-metric")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    responses = samples(response.text, "http_responses_total")
+    assert any('route="/health",status="200"' in labels for labels in responses)
+    assert any(f'route="{UNMATCHED_ROUTE}",status="404"' in labels for labels in responses)
+    assert "/no/such/path" not in response.text and "no-such-metric" not in response.text
+    for gauge in ("db_pool_pool_size", "db_pool_checked_out", "db_pool_overflow"):
+        assert f"# TYPE {gauge} gauge" in response.text
+    assert "# TYPE db_pool_checkouts counter" in response.text
+    assert "# TYPE response_cache_hits counter" in response.text
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/metrics/db-pool", "/metrics/compression"])
+async def test_metrics_require_the_configured_token(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+
+    assert (await client.get(path)).status_code == 401
+    assert (await client.get(path, headers={"Authorization": "Bearer wrong"})).status_code == 401
+    assert (await client.get(path, headers={"Authorization": "Bearer s3cret"})).status_code == 200
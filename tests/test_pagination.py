@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+
+from app.models.article import Article
+from app.models.group import Group
+from app.models.proposal import Proposal
+from app.pagination import decode_cursor, encode_cursor, parse_fields
+from app.schemas.user import UserResponse
+from tests.conftest import login
+
+SORT_KEY = (Proposal.created_at, Proposal.id)
+
+
+def test_cursor_round_trip_restores_column_types():
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    proposal_id = uuid4()
+
+    cursor = encode_cursor([created_at, proposal_id])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, SORT_KEY) == [created_at, proposal_id]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    encode_cursor(["2026-10-18T00:00:00+00:00"]),
+    encode_cursor(["not a date", str(uuid4())]),
+    encode_cursor(["2026-10-18T00:00:00+00:00", "not a uuid"]),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, SORT_KEY)
+    assert exc_info.value.status_code == 400
+
+
+def test_parse_fields_always_includes_id():
+    assert parse_fields("username, email,username", UserResponse) == ["id", "username", "email"]
+    assert parse_fields(None, UserResponse) is None
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fields("username,hashed_password", UserResponse)
+    assert exc_info.value.status_code == 400
+    assert "hashed_password" in exc_info.value.detail
+
+
+async def all_pages(client, path, **params):
+    """Follow next_cursor to the end, returning every page's items"""
+    pages, cursor = [], None
+    while True:
+        response = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.postgres
+async def test_group_pages_cover_every_row_once(client, db_engine, sample_data):
+    # Repeated names make the id tie-breaker decide the order
+    async with db_engine.begin() as conn:
+        await conn.execute(insert(Group), [{"name": f"グループ{i % 3}", "description": "説明"} for i in range(9)])
+        expected = (await conn.execute(select(Group.id, Group.name).order_by(Group.name, Group.id))).all()
+    login(sample_data.admin)
+
+    pages = await all_pages(client, "/api/v1/groups/", limit=4, fields="name")
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    items = [item for page in pages for item in page]
+    assert [(item["id"], item["name"]) for item in items] == [(str(i), name) for i, name in expected]
+    assert all(set(item) == {"id", "name"} for item in items)
+
+
+@pytest.mark.postgres
+async def test_article_pages_break_created_at_ties_by_id(client, db_engine, sample_data):
+    # One INSERT gives every article the same created_at
+    async with db_engine.begin() as conn:
+        await conn.execute(insert(Article), [
+            {"article_id": f"KB1{i:05}", "article": f"記事{i + 10}", "approval_group_id": sample_data.group_id}
+            for i in range(8)
+        ])
+        expected = (await conn.scalars(select(Article.id).order_by(Article.created_at, Article.id))).all()
+    login(sample_data.admin)
+
+    pages = await all_pages(client, "/api/v1/articles/", limit=5, fields="article_id")
+
+    assert [len(page) for page in pages] == [5, 5]
+    items = [item for page in pages for item in page]
+    assert [item["id"] for item in items] == [str(i) for i in expected]
+    assert all(set(item) == {"id", "article_id"} for item in items)
+    assert len({item["id"] for item in items}) == 10
+
+
+@pytest.mark.postgres
+async def test_last_full_page_has_no_next_cursor(client, sample_data):
+    login(sample_data.admin)
+
+    pages = await all_pages(client, "/api/v1/groups/", limit=2)
+
+    assert [[item["name"] for item in page] for page in pages] == [["グループA", "グループB"]]
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import password
+from app.config import settings
+
+
+@pytest.fixture
+def full_pool(monkeypatch):
+    """One worker busy and one call queued behind it, until release is set"""
+    monkeypatch.setattr(settings, "password_hash_workers", 1)
+    monkeypatch.setattr(settings, "password_hash_max_queue", 1)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(password, "_hash_executor", executor)
+    release = threading.Event()
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+async def fill(release):
+    blocked = [asyncio.create_task(password._run_in_pool(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert password._pending == 2
+    return blocked
+
+
+async def test_full_pool_rejects_with_retry_after(full_pool):
+    blocked = await fill(full_pool)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await password.get_password_hash("secret")
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    full_pool.set()
+    assert await asyncio.gather(*blocked) == [True, True]
+    assert password._pending == 0
+    # Capacity is given back once the queued calls finish
+    assert await password._run_in_pool(sum, [1, 2]) == 3
+
+
+@pytest.mark.postgres
+async def test_login_returns_503_while_the_pool_is_full(client, sample_data, full_pool):
+    blocked = await fill(full_pool)
+
+    response = await client.post("/api/v1/auth/login", json={"username": "user", "password": "secret"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    full_pool.set()
+    await asyncio.gather(*blocked)
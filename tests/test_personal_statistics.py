@@ -0,0 +1,66 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.api.v1.statistics import _personal_statistics_query
+from app.models.proposal_statistic import ProposalStatistic
+from tests.conftest import add_proposals, login
+
+# Asia/Tokyo is UTC+9: 15:00 UTC is already the next business day
+MARCH_31_LATE = datetime(2025, 3, 31, 14, 30, tzinfo=timezone.utc)  # 03-31 23:30 JST
+APRIL_1_EARLY = datetime(2025, 3, 31, 15, 30, tzinfo=timezone.utc)  # 04-01 00:30 JST
+APRIL_15_LATE = datetime(2025, 4, 15, 14, 50, tzinfo=timezone.utc)  # 04-15 23:50 JST
+APRIL_16_EARLY = datetime(2025, 4, 15, 15, 10, tzinfo=timezone.utc)  # 04-16 00:10 JST
+
+
+@pytest.mark.parametrize("start, end, table", [
+    (date(2025, 4, 1), date(2025, 4, 30), "proposal_statistics"),
+    (date(2025, 1, 1), date(2025, 12, 31), "proposal_statistics"),
+    (date(2025, 2, 1), date(2025, 2, 28), "proposal_statistics"),
+    (date(2025, 4, 2), date(2025, 4, 30), "proposals"),
+    (date(2025, 4, 1), date(2025, 4, 29), "proposals"),
+])
+def test_whole_months_use_the_rollup(start, end, table):
+    query = _personal_statistics_query(None, "month", start, end)
+
+    assert {t.name for t in query.get_final_froms()} == {table}
+
+
+async def seed(db_engine, sample_data):
+    for created_at in (MARCH_31_LATE, APRIL_1_EARLY, APRIL_15_LATE, APRIL_16_EARLY):
+        await add_proposals(db_engine, 1, sample_data.user, created_at=created_at)
+    login(sample_data.user)
+
+
+async def personal(client, **params):
+    response = await client.get("/api/v1/statistics/personal", params=params)
+    assert response.status_code == 200
+    return [(row["period_start"], row["total_proposals"]) for row in response.json()["statistics"]]
+
+
+@pytest.mark.postgres
+async def test_month_boundaries_follow_the_business_timezone(client, db_engine, sample_data):
+    await seed(db_engine, sample_data)
+
+    assert await personal(client, start_date="2025-03-01", end_date="2025-04-30") == [
+        ("2025-03-01", 1), ("2025-04-01", 3),
+    ]
+    assert await personal(client, period="quarter", start_date="2025-01-01", end_date="2025-06-30") == [
+        ("2025-01-01", 1), ("2025-04-01", 3),
+    ]
+
+
+@pytest.mark.postgres
+async def test_month_start_reads_the_rollup_and_mid_month_reads_proposals(client, db_engine, sample_data):
+    await seed(db_engine, sample_data)
+    # Drift the rollup so the two sources can be told apart
+    async with db_engine.begin() as conn:
+        await conn.execute(update(ProposalStatistic).values(proposal_count=ProposalStatistic.proposal_count + 10))
+
+    assert await personal(client, start_date="2025-04-01", end_date="2025-04-30") == [("2025-04-01", 13)]
+    # Mid-month ranges end at the business-timezone midnight after end_date
+    assert await personal(client, start_date="2025-03-31", end_date="2025-04-15") == [
+        ("2025-03-01", 1), ("2025-04-01", 2),
+    ]
+    assert await personal(client, start_date="2025-04-16", end_date="2025-04-30") == [("2025-04-01", 1)]
@@ -0,0 +1,101 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.auth import principal as principal_module
+from app.auth import redis as redis_module
+from app.auth.principal import Principal, PrincipalCache
+
+
+def make_principal(role: str = "一般ユーザー") -> Principal:
+    return Principal(id=uuid4(), role=role, group_id=None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(principal_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal()
+    cache.set(principal)
+
+    clock[0] += 59
+    assert cache.get(principal.id) == principal
+    clock[0] += 1
+    assert cache.get(principal.id) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(maxsize=2, ttl=60)
+    first, second, third = make_principal(), make_principal(), make_principal()
+    cache.set(first)
+    cache.set(second)
+    cache.get(first.id)
+
+    cache.set(third)
+
+    assert cache.get(second.id) is None
+    assert cache.get(first.id) == first
+    assert cache.get(third.id) == third
+
+
+def test_lookup_that_raced_an_invalidation_is_not_cached():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal()
+    generation = cache.generation
+
+    cache.invalidate(principal.id)
+    cache.set(principal, generation)
+
+    assert cache.get(principal.id) is None
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = PrincipalCache(maxsize=0, ttl=60)
+    principal = make_principal()
+    cache.set(principal)
+    assert cache.get(principal.id) is None
+
+
+async def test_invalidation_is_broadcast_to_other_workers(fake_redis, monkeypatch):
+    local, other = PrincipalCache(maxsize=10, ttl=60), PrincipalCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    monkeypatch.setattr(redis_module, "principal_cache", local)
+    await other.start(fake_redis)
+    try:
+        for _ in range(300):
+            if other.stats()["synced"]:
+                break
+            await asyncio.sleep(0.01)
+        principal = make_principal("管理者")
+        local.set(principal)
+        other.set(principal)
+
+        await redis_module.invalidate_principal(principal.id)
+
+        assert local.get(principal.id) is None
+        for _ in range(300):
+            if principal.id not in other._entries:
+                break
+            await asyncio.sleep(0.01)
+        assert other.get(principal.id) is None
+    finally:
+        await other.stop()
+
+
+async def test_cache_is_bypassed_while_sync_is_down(fake_redis):
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    await cache.start(fake_redis)
+    await cache.stop()
+    principal = make_principal()
+
+    cache.set(principal)
+
+    assert cache.get(principal.id) is None
+    assert not cache.stats()["synced"]
@@ -0,0 +1,53 @@
+from datetime import date
+from uuid import uuid4
+
+from app.models.proposal import Proposal
+from app.services.proposal_diff import SNAPSHOT_FIELDS, diff, snapshot, snapshot_values
+
+
+def make_proposal(**fields) -> Proposal:
+    values = {
+        "id": uuid4(),
+        "type": "修正",
+        "status": "申請中",
+        "title": "パスワード再設定手順",
+        "keywords": "パスワード",
+        "importance": False,
+        "published_start": date(2026, 4, 1),
+        "target": "社内向け",
+        "answer": "設定画面から再設定します。",
+    }
+    values.update(fields)
+    return Proposal(**values)
+
+
+def test_snapshot_values_cover_every_snapshot_field():
+    values = snapshot_values({"title": "旧タイトル"})
+
+    assert set(values) == {f"{field}_before" for field in SNAPSHOT_FIELDS}
+    assert values["title_before"] == "旧タイトル"
+    assert values["answer_before"] is None
+
+
+def test_diff_lists_only_changed_fields():
+    proposal = make_proposal()
+    before = {field: getattr(proposal, field) for field in SNAPSHOT_FIELDS}
+    before.update(title="パスワード変更手順", importance=True)
+    proposal.proposal_before = snapshot(before)
+
+    result = diff(proposal)
+
+    assert result["proposal_id"] == proposal.id
+    assert result["has_snapshot"] is True
+    assert result["changes"] == [
+        {"field": "title", "before": "パスワード変更手順", "after": "パスワード再設定手順"},
+        {"field": "importance", "before": True, "after": False},
+    ]
+
+
+def test_diff_without_snapshot():
+    result = diff(make_proposal(type="削除"))
+
+    assert result["has_snapshot"] is False
+    assert result["changes"] == []
+    assert result["type"] == "削除"
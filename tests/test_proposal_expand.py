@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+
+from app.api.v1.proposals import PROPOSAL_EXPANSIONS, expand_options
+from app.auth import Principal
+from tests.conftest import add_proposals, login
+
+
+def strategies(options):
+    """{relationship: lazy strategy} for the loader options expand_options returns"""
+    return {o.context[0].path[1].key: dict(o.context[0].strategy)["lazy"] for o in options}
+
+
+def test_only_requested_relationships_are_selectin_loaded():
+    assert strategies(expand_options(" approver,user,approver ")) == {
+        "user": "selectin", "approval_group": "noload", "info_category": "noload", "approver": "selectin",
+    }
+    assert set(strategies(expand_options(None)).values()) == {"noload"}
+    assert set(strategies(expand_options(",".join(PROPOSAL_EXPANSIONS))).values()) == {"selectin"}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/proposals/", "/api/v1/proposals/pending-approval"])
+async def test_unknown_expansions_are_rejected(client, path):
+    login(Principal(id=uuid.uuid4(), role="SV", group_id=uuid.uuid4()))
+
+    response = await client.get(path, params={"expand": "user,comments,approver,secrets"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown expansions: comments, secrets"
+
+
+@pytest.mark.postgres
+async def test_expanded_list_embeds_only_the_requested_relationships(client, db_engine, sample_data):
+    await add_proposals(db_engine, 3, sample_data.user)
+    login(sample_data.admin)
+
+    response = await client.get("/api/v1/proposals/", params={"expand": "user,approval_group"})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 3
+    for item in items:
+        assert item["user"] == {"id": str(sample_data.user.id), "username": sample_data.user.username}
+        assert item["approval_group"]["id"] == str(sample_data.group_id)
+        assert item["info_category"] is None and item["approver"] is None
+    # One SELECT for the page and one SELECT ... IN per expansion, however many rows
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+
+
+@pytest.mark.postgres
+async def test_unexpanded_list_leaves_relationships_null(client, db_engine, sample_data):
+    await add_proposals(db_engine, 2, sample_data.user)
+    login(sample_data.admin)
+
+    response = await client.get("/api/v1/proposals/")
+
+    assert response.status_code == 200
+    for item in response.json()["items"]:
+        assert [item[name] for name in PROPOSAL_EXPANSIONS] == [None] * len(PROPOSAL_EXPANSIONS)
+    assert 'desc="1 queries"' in response.headers["server-timing"]
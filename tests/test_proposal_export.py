@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.api.v1.proposals import PROPOSAL_SORT_KEY
+from app.config import settings
+from app.database import engine
+from app.services.proposal_export import PROPOSAL_EXPORT_COLUMNS, _ndjson_lines, stream_proposals
+from tests.conftest import add_proposals, login
+
+
+def test_ndjson_lines_use_iso_timestamps():
+    proposal_id = uuid.uuid4()
+    row = (proposal_id, datetime(2026, 4, 1, 0, 30, tzinfo=timezone.utc), date(2026, 4, 1), None, "経費精算")
+
+    line = _ndjson_lines(["id", "created_at", "published_start", "keywords", "title"], [row])
+
+    assert line.endswith(b"\n")
+    assert json.loads(line) == {
+        "id": str(proposal_id),
+        "created_at": "2026-04-01T00:30:00Z",
+        "published_start": "2026-04-01",
+        "keywords": None,
+        "title": "経費精算",
+    }
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+async def test_export_streams_the_visible_proposals(client, db_engine, sample_data, file_format):
+    own = await add_proposals(db_engine, 3, sample_data.user, keywords="経費,精算")
+    await add_proposals(db_engine, 2, sample_data.other_user, "KB000002")
+    login(sample_data.user)
+
+    response = await client.get("/api/v1/proposals/export", params={"format": file_format})
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == f'attachment; filename="proposals.{file_format}"'
+    if file_format == "csv":
+        header, *records = list(csv.reader(io.StringIO(response.text)))
+        assert header == [column.name for column in PROPOSAL_EXPORT_COLUMNS]
+        records = [dict(zip(header, record)) for record in records]
+    else:
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert records[0]["created_at"].endswith("Z")
+    assert sorted(record["id"] for record in records) == sorted(str(i) for i in own)
+    assert {record["keywords"] for record in records} == {"経費,精算"}
+
+
+@pytest.mark.postgres
+async def test_export_memory_does_not_grow_with_row_count(db_engine, sample_data, monkeypatch):
+    monkeypatch.setattr(settings, "export_batch_size", 100)
+    await add_proposals(db_engine, 4000, sample_data.user, answer="担当部署の窓口にお問い合わせください。" * 20)
+    query = select(*PROPOSAL_EXPORT_COLUMNS).order_by(*PROPOSAL_SORT_KEY)
+
+    async def peak_memory(limit):
+        chunks = 0
+        tracemalloc.start()
+        try:
+            async for chunk in stream_proposals(query.limit(limit), "ndjson"):
+                assert chunk.count(b"\n") <= 100
+                chunks += 1
+            return tracemalloc.get_traced_memory()[1], chunks
+        finally:
+            tracemalloc.stop()
+
+    try:
+        await peak_memory(100)  # warm up statement caches
+        small, small_chunks = await peak_memory(1000)
+        large, large_chunks = await peak_memory(4000)
+    finally:
+        # stream_proposals() uses the application's pool, bound to this test's event loop
+        await engine.dispose()
+
+    assert (small_chunks, large_chunks) == (10, 40)
+    assert large < small * 1.5
@@ -0,0 +1,113 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.auth import Principal
+from app.config import settings
+from app.models.proposal import Proposal
+from app.models.proposal_before import ProposalBefore
+from app.models.proposal_statistic import ProposalStatistic
+from app.services.proposal_import import _parse
+from tests.conftest import login
+
+ROW = {"article_id": "KB000001", "article": "記事1", "type": "修正", "title": "手順の更新", "reason": "手順が変わったため"}
+
+
+def jsonl(*lines):
+    return "\n".join(line if isinstance(line, str) else json.dumps(line, ensure_ascii=False) for line in lines)
+
+
+def events(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_jsonl_rows_are_numbered_by_line():
+    content = jsonl(ROW, "", "{not json", [1], {**ROW, "reason": None}, {**ROW, "before": {"title": "旧"}})
+
+    rows, errors = _parse(content, "jsonl")
+
+    assert [(number, row.title) for number, row in rows] == [(1, "手順の更新"), (6, "手順の更新")]
+    assert rows[1][1].before.title == "旧"
+    assert errors[0]["row"] == 3 and errors[0]["detail"].startswith("Invalid JSON")
+    assert errors[1] == {"row": 4, "detail": "Row must be a JSON object"}
+    assert errors[2]["row"] == 5 and errors[2]["detail"][0]["loc"] == ("reason",)
+
+
+def test_csv_rows_are_numbered_by_data_row():
+    content = (
+        "article_id,article,type,title,reason,keywords\n"
+        "KB000001,記事1,修正,手順の更新,手順が変わったため,\n"
+        "KB000001,記事1,修正,手順の更新,手順が変わったため,経費,余分な列\n"
+        "KB000001,記事1,変更,手順の更新,手順が変わったため,経費\n"
+    )
+
+    rows, errors = _parse(content, "csv")
+
+    assert [(number, row.keywords) for number, row in rows] == [(1, None)]
+    assert errors[0] == {"row": 2, "detail": "Unexpected extra columns: 1"}
+    assert errors[1]["row"] == 3 and errors[1]["detail"][0]["loc"] == ("type",)
+
+
+async def test_upload_over_the_size_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_import_max_bytes", 10)
+    login(Principal(id=uuid.uuid4(), role="一般ユーザー", group_id=None))
+
+    response = await client.post("/api/v1/proposals/bulk", files={"file": ("rows.jsonl", b"x" * 11)})
+
+    assert response.status_code == 413
+
+
+@pytest.mark.postgres
+async def test_import_falls_back_to_single_rows_and_reports_counts(client, db_engine, sample_data, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_import_chunk_size", 2)
+    login(sample_data.user)
+    content = jsonl(
+        ROW,
+        "{not json",
+        {**ROW, "before": {"title": "旧タイトル"}},
+        {**ROW, "article_id": "KB999999"},
+        {**ROW, "info_category_id": str(uuid.uuid4())},
+        ROW,
+    )
+
+    response = await client.post(
+        "/api/v1/proposals/bulk", files={"file": ("rows.jsonl", content.encode(), "application/x-ndjson")}
+    )
+
+    assert response.status_code == 200
+    sent = events(response)
+    assert [(e["event"], e.get("row")) for e in sent] == [
+        ("error", 2), ("error", 4), ("progress", None), ("error", 5), ("progress", None), ("done", None),
+    ]
+    assert sent[1]["detail"] == "Article not found"
+    # The second chunk failed on row 5's foreign key and was retried row by row
+    assert "info_category_id" in sent[3]["detail"]
+    assert [(e["inserted"], e["failed"]) for e in sent if e["event"] == "progress"] == [(2, 2), (3, 3)]
+    assert sent[-1] == {"event": "done", "total": 6, "inserted": 3, "failed": 3}
+
+    async with db_engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(Proposal)) == 3
+        assert await conn.scalar(select(ProposalBefore.title_before)) == "旧タイトル"
+        assert await conn.scalar(select(func.sum(ProposalStatistic.proposal_count))) == 3
+
+
+@pytest.mark.postgres
+async def test_csv_upload(client, db_engine, sample_data):
+    login(sample_data.user)
+    content = (
+        "\ufeffarticle_id,article,type,title,reason\n"
+        "KB000001,記事1,修正,手順の更新,手順が変わったため\n"
+        "KB000002,記事2,削除,古い記事,不要になったため,余分な列\n"
+        "KB000002,記事2,削除,古い記事,不要になったため\n"
+    )
+
+    response = await client.post("/api/v1/proposals/bulk", files={"file": ("rows.csv", content.encode())})
+
+    sent = events(response)
+    assert sent[0] == {"event": "error", "row": 2, "detail": "Unexpected extra columns: 1"}
+    assert sent[-1] == {"event": "done", "total": 3, "inserted": 2, "failed": 1}
+    async with db_engine.connect() as conn:
+        groups = (await conn.scalars(select(Proposal.approval_group_id))).all()
+    assert sorted(groups) == sorted([sample_data.group_id, sample_data.other_group_id])
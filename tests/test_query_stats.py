@@ -0,0 +1,94 @@
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.middleware.query_stats import QueryStatsMiddleware, current_query_stats, instrument_engine
+from tests.conftest import login
+
+
+@pytest.fixture
+def engine():
+    # In-memory SQLite: the same engine events as PostgreSQL, without a server
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def make_client(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, repeat: int = 1):
+        with engine.connect() as conn:
+            for _ in range(repeat):
+                conn.execute(text("SELECT :item_id"), {"item_id": item_id}).scalar()
+            conn.execute(text("SELECT 1")).scalar()
+        stats = current_query_stats.get()
+        return {"queries": stats.count}
+
+    return TestClient(app)
+
+
+def test_server_timing_reports_the_request_queries(engine):
+    response = make_client(engine).get("/items/7", params={"repeat": 3})
+
+    assert response.json() == {"queries": 4}
+    assert re.fullmatch(r'db;dur=\d+\.\d;desc="4 queries"', response.headers["server-timing"])
+
+
+def test_server_timing_is_not_sent_in_production(engine, monkeypatch):
+    monkeypatch.setattr(settings, "environment", "production")
+
+    response = make_client(engine).get("/items/7")
+
+    assert response.json() == {"queries": 2}
+    assert "server-timing" not in response.headers
+
+
+def test_queries_outside_a_request_are_not_counted(engine):
+    client = make_client(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert current_query_stats.get() is None
+    assert client.get("/items/1").json() == {"queries": 2}
+
+
+def test_repeated_statement_is_reported_once_as_n_plus_one(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 2)
+    caplog.set_level(logging.WARNING, logger="app.middleware.query_stats")
+
+    make_client(engine).get("/items/7", params={"repeat": 6})
+
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert warnings == ["Possible N+1 in GET /items/{item_id}: statement ran 3 times in one request: SELECT ?"]
+
+
+def test_slow_statements_are_logged_with_their_route(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+    caplog.set_level(logging.WARNING, logger="app.middleware.query_stats")
+
+    make_client(engine).get("/items/7")
+
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert len(slow) == 2
+    assert all(message.startswith("Slow query in GET /items/{item_id} (") for message in slow)
+    assert slow[0].endswith("): SELECT ?") and slow[1].endswith("): SELECT 1")
+
+
+@pytest.mark.postgres
+async def test_async_session_queries_are_counted(client, sample_data):
+    # The async engine runs its events in greenlets that see the request's ContextVar
+    login(sample_data.admin)
+
+    response = await client.get("/api/v1/groups/")
+
+    assert response.status_code == 200
+    assert re.search(r'desc="[1-9]\d* queries"', response.headers["server-timing"])
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import jwt as jwt_module
+from app.auth import redis as redis_module
+from app.auth.keys import key_store
+from app.auth.revocation import BLACKLIST_KEY_PREFIX, RevocationFilter
+
+
+@pytest.fixture
+def redis_client(fake_redis, monkeypatch):
+    """Route app.auth.redis through fakeredis with a filter that is not yet synced"""
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    monkeypatch.setattr(redis_module, "revocation_filter", RevocationFilter())
+    return fake_redis
+
+
+async def wait_until(condition, timeout: float = 3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+async def test_blacklisted_token_is_stored_with_ttl(redis_client):
+    await redis_module.add_token_to_blacklist("jti-1", 60)
+
+    assert await redis_module.is_token_blacklisted("jti-1")
+    assert not await redis_module.is_token_blacklisted("jti-2")
+    assert 0 < await redis_client.ttl(f"{BLACKLIST_KEY_PREFIX}jti-1") <= 60
+
+
+async def test_refresh_token_store(redis_client):
+    await redis_module.store_refresh_token("user-1", "token", 60)
+    assert await redis_module.get_refresh_token("user-1") == "token"
+
+    await redis_module.delete_refresh_token("user-1")
+    assert await redis_module.get_refresh_token("user-1") is None
+
+
+async def test_revocation_filter_seeds_from_redis_and_follows_pubsub(redis_client):
+    await redis_client.setex(f"{BLACKLIST_KEY_PREFIX}seeded", 60, "true")
+    other_worker = RevocationFilter()
+    await other_worker.start(redis_client)
+    try:
+        await wait_until(lambda: other_worker.ready)
+        assert other_worker.might_contain("seeded")
+        assert not other_worker.might_contain("never-revoked")
+
+        await redis_module.add_token_to_blacklist("revoked-later", 60)
+        await wait_until(lambda: other_worker.might_contain("revoked-later"))
+    finally:
+        await other_worker.stop()
+    assert not other_worker.ready
+
+
+async def test_unsynced_filter_falls_through_to_redis(redis_client):
+    await redis_client.setex(f"{BLACKLIST_KEY_PREFIX}elsewhere", 60, "true")
+
+    assert not redis_module.revocation_filter.ready
+    assert await redis_module.is_token_blacklisted("elsewhere")
+
+
+async def test_verify_token_rejects_revoked_token(redis_client, jwt_keys, monkeypatch):
+    monkeypatch.setattr(jwt_module, "is_token_blacklisted", redis_module.is_token_blacklisted)
+    key_store.load()
+    token = jwt_module.create_access_token({"sub": "00000000-0000-0000-0000-000000000001"})
+    payload = await jwt_module.verify_token(token)
+
+    await redis_module.add_token_to_blacklist(payload["jti"], 60)
+    with pytest.raises(HTTPException) as exc_info:
+        await jwt_module.verify_token(token)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app import cache as cache_module
+from app.cache import ResponseCache, statistics_version
+from tests.conftest import add_proposals, login
+
+
+@pytest.fixture
+def cache(fake_redis, monkeypatch):
+    cache = ResponseCache(fake_redis)
+    monkeypatch.setattr(cache_module, "response_cache", cache)
+    return cache
+
+
+def slow_compute(calls, result, release):
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return result
+    return compute
+
+
+async def test_concurrent_misses_share_one_computation(cache):
+    calls, release = [], asyncio.Event()
+    compute = slow_compute(calls, {"total": 3}, release)
+
+    waiters = [
+        asyncio.create_task(cache.get_or_compute("approval-statistics", "statistics", {}, compute, 60))
+        for _ in range(10)
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert results == [{"total": 3}] * 10
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 0, "misses": 1, "coalesced": 9, "errors": 0, "inflight": 0}
+    assert await cache.get_or_compute("approval-statistics", "statistics", {}, compute, 60) == {"total": 3}
+    assert (len(calls), cache.hits) == (1, 1)
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_computation(cache):
+    calls, release = [], asyncio.Event()
+    compute = slow_compute(calls, [1, 2], release)
+
+    first = asyncio.create_task(cache.get_or_compute("monthly-trends", "statistics", {"year": 2026}, compute, 60))
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(cache.get_or_compute("monthly-trends", "statistics", {"year": 2026}, compute, 60))
+    await asyncio.sleep(0.05)
+    first.cancel()
+    release.set()
+
+    assert await second == [1, 2]
+    assert first.cancelled()
+    assert len(calls) == 1
+    # The result was stored even though the request that started it went away
+    assert await cache.get_or_compute("monthly-trends", "statistics", {"year": 2026}, compute, 60) == [1, 2]
+    assert len(calls) == 1
+
+
+async def test_write_invalidates_admin_and_group_entries(cache):
+    group_id, other_group_id = uuid.uuid4(), uuid.uuid4()
+    results = iter(range(100))
+
+    async def compute():
+        return next(results)
+
+    async def get(version_name):
+        return await cache.get_or_compute("approval-statistics", version_name, {}, compute, 60)
+
+    before = [await get(statistics_version()), await get(statistics_version(group_id)),
+              await get(statistics_version(other_group_id))]
+    assert [await get(statistics_version()), await get(statistics_version(group_id)),
+            await get(statistics_version(other_group_id))] == before
+
+    await cache_module.invalidate_statistics(group_id)
+
+    after = [await get(statistics_version()), await get(statistics_version(group_id)),
+             await get(statistics_version(other_group_id))]
+    assert after[0] != before[0]
+    assert after[1] != before[1]
+    assert after[2] == before[2]
+
+
+@pytest.mark.postgres
+async def test_statistics_reflect_a_new_proposal(client, db_engine, sample_data):
+    await add_proposals(db_engine, 2, sample_data.user)
+    login(sample_data.sv)
+    assert (await client.get("/api/v1/statistics/approval-statistics")).json()["total_proposals"] == 2
+
+    login(sample_data.user)
+    created = await client.post("/api/v1/proposals/", json={
+        "article_id": "KB000001", "article": "記事1", "type": "修正", "title": "手順の更新", "reason": "手順が変わったため",
+    })
+    assert created.status_code == 200
+
+    login(sample_data.sv)
+    assert (await client.get("/api/v1/statistics/approval-statistics")).json()["total_proposals"] == 3
@@ -0,0 +1,33 @@
+from app.auth.revocation import BloomFilter, RevocationFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate_is_near_target():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    for i in range(10000):
+        bloom.add(f"revoked-{i}")
+
+    false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+
+    assert false_positives / 10000 < 0.02
+
+
+def test_bloom_filter_sizing():
+    bloom = BloomFilter(capacity=100000, error_rate=0.001)
+    # About 14.4 bits and 10 hashes per item for a 0.1% error rate
+    assert 1_400_000 < bloom.size < 1_500_000
+    assert bloom.hash_count == 10
+
+
+def test_unsynced_revocation_filter_reports_possible_hits():
+    revocation_filter = RevocationFilter()
+    assert not revocation_filter.ready
+    assert revocation_filter.might_contain("anything")
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.proposal import Proposal
+from app.models.proposal_statistic import ProposalStatistic
+from app.services import statistics_rollup
+from tests.conftest import add_proposals
+
+pytestmark = pytest.mark.postgres
+
+ROLLUP_COLUMNS = [getattr(ProposalStatistic, key) for key in statistics_rollup.ROLLUP_KEY]
+
+
+async def rollup(db):
+    rows = await db.execute(select(*ROLLUP_COLUMNS, ProposalStatistic.proposal_count).order_by(*ROLLUP_COLUMNS))
+    return [tuple(row) for row in rows]
+
+
+async def recount(db):
+    month = statistics_rollup.month_of(Proposal.created_at)
+    key = [Proposal.approval_group_id, Proposal.user_id, month, Proposal.type, Proposal.status]
+    rows = await db.execute(select(*key, func.count()).group_by(*key).order_by(*key))
+    return [tuple(row) for row in rows]
+
+
+async def test_adjust_adds_deltas_to_the_matching_row(db_engine, sample_data):
+    first, _ = await add_proposals(db_engine, 2, sample_data.user)
+    async with AsyncSession(db_engine) as db:
+        [(group_id, user_id, _, proposal_type, status, count)] = await rollup(db)
+        assert (group_id, user_id, proposal_type, status, count) == (
+            sample_data.group_id, sample_data.user.id, "修正", "申請中", 2
+        )
+
+        # Moving one proposal to another status, as the approve endpoint does
+        await statistics_rollup.adjust(db, first, -1)
+        await db.execute(update(Proposal).where(Proposal.id == first).values(
+            status="承認済み", approved_by=sample_data.sv.id
+        ))
+        await statistics_rollup.adjust(db, first, 1)
+        await db.commit()
+
+        assert {(row[4], row[5]) for row in await rollup(db)} == {("承認済み", 1), ("申請中", 1)}
+        assert await rollup(db) == await recount(db)
+
+
+async def test_rows_brought_to_zero_are_deleted(db_engine, sample_data):
+    ids = await add_proposals(db_engine, 2, sample_data.user)
+    await add_proposals(db_engine, 1, sample_data.other_user, "KB000002")
+    async with AsyncSession(db_engine) as db:
+        await statistics_rollup.adjust_many(db, ids, -1)
+        await db.execute(delete(Proposal).where(Proposal.id.in_(ids)))
+        await db.commit()
+
+        rows = await rollup(db)
+        assert [(row[1], row[5]) for row in rows] == [(sample_data.other_user.id, 1)]
+        assert await db.scalar(select(func.count()).where(ProposalStatistic.proposal_count == 0)) == 0
+
+
+async def test_rebuild_matches_a_recount(db_engine, sample_data):
+    await add_proposals(db_engine, 3, sample_data.user)
+    await add_proposals(db_engine, 2, sample_data.user, type="削除", status="却下", rejection_reason="不備")
+    await add_proposals(db_engine, 2, sample_data.other_user, "KB000002", status="承認済み")
+    async with AsyncSession(db_engine) as db:
+        # Drift the rollup away from the proposals, then rebuild it
+        await db.execute(update(ProposalStatistic).values(proposal_count=ProposalStatistic.proposal_count + 5))
+        await db.execute(delete(ProposalStatistic).where(ProposalStatistic.status == "却下"))
+        await db.commit()
+
+        await statistics_rollup.rebuild(db)
+        await db.commit()
+
+        rows = await rollup(db)
+        assert rows == await recount(db)
+        assert sum(row[5] for row in rows) == 7